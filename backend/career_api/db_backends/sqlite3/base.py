@@ -0,0 +1,124 @@
+"""
+SQLite backend tuned for a multi-threaded web server
+
+Same as django.db.backends.sqlite3, plus two things:
+
+1. Every new connection runs DEFAULT_PRAGMAS (WAL journal,
+   synchronous=NORMAL, busy timeout, mmap and page cache size), updated
+   with OPTIONS['pragmas']. In WAL mode readers never block the writer
+   and the writer never blocks readers.
+
+2. With OPTIONS['serialize_writes'], transaction.atomic() blocks take a
+   process-wide lock per database file and begin with BEGIN IMMEDIATE.
+   SQLite allows one writer at a time. With deferred transactions, two
+   threads that both read and then write can deadlock on the lock upgrade.
+   SQLite reports that at once as "database is locked" and does not wait
+   out the busy timeout. Writers from this process now queue on the lock
+   instead. Reads outside atomic() never take it, and neither do
+   single-statement autocommit writes, which are covered by the busy
+   timeout.
+
+Settings:
+DATABASES = {
+    'default': {
+        'ENGINE': 'career_api.db_backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'pragmas': {'busy_timeout': 10000},  # overrides only
+            'serialize_writes': True,
+        },
+    }
+}
+"""
+import threading
+
+from django.db.backends.sqlite3 import base
+from django.db.utils import OperationalError
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'wal',
+    # Durable against application crashes; an OS crash may lose the last
+    # commits but never corrupts the database in WAL mode
+    'synchronous': 'normal',
+    'busy_timeout': 5000,  # ms
+    'mmap_size': 256 * 1024 * 1024,  # bytes
+    'cache_size': -64 * 1024,  # negative = KiB, i.e. 64 MiB per connection
+}
+
+# Options consumed here; everything else in OPTIONS goes to sqlite3.connect()
+BACKEND_OPTIONS = ('pragmas', 'serialize_writes')
+
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+def write_lock(name):
+    """The process-wide writer lock of one database file."""
+    key = str(name)
+    with _write_locks_guard:
+        return _write_locks.setdefault(key, threading.Lock())
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    holds_write_lock = False
+
+    @property
+    def pragmas(self):
+        pragmas = dict(DEFAULT_PRAGMAS)
+        pragmas.update(self.settings_dict['OPTIONS'].get('pragmas', {}))
+        return pragmas
+
+    @property
+    def serialize_writes(self):
+        return self.settings_dict['OPTIONS'].get('serialize_writes', True)
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        for option in BACKEND_OPTIONS:
+            kwargs.pop(option, None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for pragma, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if not self.serialize_writes:
+            return super()._start_transaction_under_autocommit()
+
+        # Wait for other writers no longer than SQLite itself would
+        timeout = self.pragmas['busy_timeout'] / 1000
+        if not write_lock(self.settings_dict['NAME']).acquire(timeout=timeout):
+            raise OperationalError('database is locked (timed out waiting for the write lock)')
+        self.holds_write_lock = True
+        try:
+            self.cursor().execute('BEGIN IMMEDIATE')
+        except BaseException:
+            self._release_write_lock()
+            raise
+
+    def _release_write_lock(self):
+        if self.holds_write_lock:
+            self.holds_write_lock = False
+            write_lock(self.settings_dict['NAME']).release()
+
+    def _commit(self):
+        try:
+            super()._commit()
+        finally:
+            self._release_write_lock()
+
+    def _rollback(self):
+        try:
+            super()._rollback()
+        finally:
+            self._release_write_lock()
+
+    def _close(self):
+        try:
+            super()._close()
+        finally:
+            self._release_write_lock()
@@ -0,0 +1,95 @@
+"""
+Read/write splitting between the primary database and a read replica
+
+PrimaryReplicaRouter sends reads of the apps in DATABASE_REPLICA_APPS to
+the DATABASE_REPLICA_ALIAS connection, and every write to 'default'.
+Reads stay on the primary when:
+- no replica is configured (DATABASE_REPLICA_ALIAS is None);
+- the primary is inside transaction.atomic(), so a transaction sees its
+  own uncommitted rows;
+- the current request is pinned with pin_to_primary(). The middleware
+  pins unsafe requests (POST, PUT, ...). It also pins every request in the
+  REPLICA_STICKY_SECONDS after one, via a cookie, so a user who just
+  submitted sees the new assessment in their history before the replica
+  catches up.
+
+Sessions and users are not in DATABASE_REPLICA_APPS. A login must be
+visible on the very next request.
+
+Locally the replica is a second SQLite file, refreshed from the primary
+with `python manage.py sync_replica` (see settings.DATABASE_REPLICA).
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = 'primary_until'
+
+_pinned = contextvars.ContextVar('pinned_to_primary', default=False)
+
+
+@contextmanager
+def pin_to_primary():
+    """Route every read in this block (and this request) to the primary."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        alias = settings.DATABASE_REPLICA_ALIAS
+        if (
+            alias is None
+            or model._meta.app_label not in settings.DATABASE_REPLICA_APPS
+            or is_pinned()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema with the data, never from migrate
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaStickinessMiddleware:
+    """Pin writes, and reads shortly after a write by the same client, to the primary."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writing = request.method not in ('GET', 'HEAD', 'OPTIONS')
+        try:
+            recent_write = float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            recent_write = False
+
+        if not (writing or recent_write):
+            return self.get_response(request)
+
+        with pin_to_primary():
+            response = self.get_response(request)
+        if writing and response.status_code < 400:
+            sticky = settings.REPLICA_STICKY_SECONDS
+            response.set_cookie(PIN_COOKIE, f'{time.time() + sticky:.3f}', max_age=sticky,
+                                httponly=True, samesite='Lax')
+        return response
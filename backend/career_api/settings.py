@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -53,6 +54,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'career_api.db_routing.ReplicaStickinessMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -81,14 +83,45 @@ WSGI_APPLICATION = 'career_api.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# career_api.db_backends.sqlite3 adds WAL/busy-timeout PRAGMAs and queues
+# this process's write transactions (see its module docstring).
+# SQLITE_TUNING=0 falls back to Django's stock backend.
+SQLITE_TUNING = os.environ.get('SQLITE_TUNING', '1') == '1'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'career_api.db_backends.sqlite3' if SQLITE_TUNING else 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Overrides of the backend's DEFAULT_PRAGMAS, e.g. {'busy_timeout': 10000}
+            'pragmas': {},
+            'serialize_writes': True,
+        } if SQLITE_TUNING else {},
     }
 }
 
 
+# Read replica (see career_api/db_routing.py). DATABASE_REPLICA is the path
+# of a second SQLite file standing in for a replica; refresh it with
+# `python manage.py sync_replica`. Unset, everything uses 'default'.
+DATABASE_REPLICA = os.environ.get('DATABASE_REPLICA')
+DATABASE_REPLICA_ALIAS = 'replica' if DATABASE_REPLICA else None
+if DATABASE_REPLICA:
+    DATABASES['replica'] = dict(
+        DATABASES['default'],
+        NAME=DATABASE_REPLICA,
+        # Tests read the test database through the replica alias
+        TEST={'MIRROR': 'default'},
+    )
+
+DATABASE_ROUTERS = ['career_api.db_routing.PrimaryReplicaRouter']
+# Apps whose reads may go to the replica
+DATABASE_REPLICA_APPS = ['recommendations']
+# After a write, the same client reads from the primary for this long;
+# must exceed the replica lag
+REPLICA_STICKY_SECONDS = 5
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -141,6 +174,33 @@ REST_FRAMEWORK = {
 }
 AUTH_USER_MODEL = 'users.CustomUser'
 
+# Keyset pagination of history and career list (see recommendations/pagination.py);
+# clients may ask for up to MAX_PAGE_SIZE rows with ?page_size=
+RECOMMENDATIONS_PAGINATION = {
+    'HISTORY_PAGE_SIZE': 20,
+    'CAREERS_PAGE_SIZE': 50,
+    'MAX_PAGE_SIZE': 100,
+}
+
+# ML inference
+# The ML stack (NumPy, model artifacts) is imported lazily so management
+# commands start fast. With ML_PRELOAD the WSGI entry point imports it and
+# runs a warm-up prediction before serving; otherwise the first prediction
+# or readiness probe does.
+ML_PRELOAD = os.environ.get('ML_PRELOAD', '1') == '1'
+
+# Concurrent assessment submissions are grouped into micro-batches and
+# scored with one vectorized model call (see ml_model/batching.py). Turn it
+# on (ML_MICRO_BATCHING=1) only under threaded or async workers; a sync
+# worker has one request in flight, so batching would only add MAX_WAIT_MS
+# to every submission.
+ML_MICRO_BATCHING = {
+    'ENABLED': os.environ.get('ML_MICRO_BATCHING', '0') == '1',
+    'MAX_BATCH_SIZE': 32,
+    'MAX_WAIT_MS': 2,
+    'TIMEOUT_SECONDS': 10,
+}
+
 # CORS Settings (should be at bottom of settings.py)
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
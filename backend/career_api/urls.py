@@ -20,5 +20,6 @@ from django.urls import path, include
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('users.urls')),
+    path('api/health/', include('ml_model.urls')),
     path('api/', include('recommendations.urls')),
 ]
\ No newline at end of file
@@ -9,8 +9,18 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'career_api.settings')
 
 application = get_wsgi_application()
+
+# Opt-in: share one copy of the model across workers (see ml_model/shared.py)
+if os.environ.get('CAREER_MODEL_SHM_PUBLISH') == '1' or os.environ.get('CAREER_MODEL_SHM_NAME'):
+    from ml_model.shared import setup_from_environment
+    setup_from_environment()
+
+if settings.ML_PRELOAD:
+    from ml_model.engine import preload
+    preload()
@@ -0,0 +1,164 @@
+"""Dynamic micro-batching in front of predict_careers_batch.
+
+Concurrent callers submit single assessments; a background thread collects
+them into batches of at most ``max_batch_size`` rows, waiting no longer
+than ``max_wait_ms`` after the first row arrives, scores each batch with
+one vectorized call and resolves every caller's future.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _Request:
+    __slots__ = ("assessment_data", "top_k", "future", "enqueued_at")
+
+    def __init__(self, assessment_data: Dict, top_k: int):
+        self.assessment_data = assessment_data
+        self.top_k = top_k
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class MicroBatcher:
+    """Queue single predictions and run them as vectorized micro-batches."""
+
+    def __init__(self, predict_batch: Callable[[Sequence[Dict], int], List[List[Dict]]],
+                 max_batch_size: int = 32, max_wait_ms: float = 2.0, latency_window: int = 1000):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._started_at = None
+        self.requests = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.largest_batch = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._started_at = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name="career-micro-batcher", daemon=True)
+            self._thread.start()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Finish the queued work and stop the worker thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
+
+    def submit(self, assessment_data: Dict, top_k: int = 5) -> Future:
+        """Queue one assessment; the future resolves to its predict_careers result."""
+        self.start()
+        request = _Request(assessment_data, top_k)
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, assessment_data: Dict, top_k: int = 5, timeout: Optional[float] = None) -> List[Dict]:
+        return self.submit(assessment_data, top_k).result(timeout)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+                "queue_depth": self._queue.qsize(),
+                "throughput_per_sec": round(self.requests / elapsed, 2) if elapsed else 0.0,
+                "latency_ms": {
+                    "p50": round(_percentile(latencies, 0.50) * 1000, 3),
+                    "p95": round(_percentile(latencies, 0.95) * 1000, 3),
+                    "p99": round(_percentile(latencies, 0.99) * 1000, 3),
+                },
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _collect(self, first: _Request):
+        batch = [first]
+        stop = False
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch, stop = self._collect(item)
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch: List[_Request]) -> None:
+        by_top_k: Dict[int, List[_Request]] = {}
+        for request in batch:
+            by_top_k.setdefault(request.top_k, []).append(request)
+
+        failed = False
+        for top_k, requests in by_top_k.items():
+            try:
+                results = self.predict_batch([r.assessment_data for r in requests], top_k)
+            except Exception as e:
+                failed = True
+                logger.exception("Micro-batch of %d predictions failed", len(requests))
+                for request in requests:
+                    request.future.set_exception(e)
+                continue
+            for request, result in zip(requests, results):
+                request.future.set_result(result)
+
+        finished = time.perf_counter()
+        with self._stats_lock:
+            self.requests += len(batch)
+            self.batches += 1
+            self.failed_batches += int(failed)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self._latencies.extend(finished - request.enqueued_at for request in batch)
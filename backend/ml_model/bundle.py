@@ -0,0 +1,242 @@
+"""Versioned, memory-mappable model artifact bundle.
+
+A bundle is a directory holding ``manifest.json`` plus one ``.npy`` file
+per array (tree structure and vocabularies). Bundles live side by side
+under an artifact root and a ``CURRENT`` file names the one to serve::
+
+    artifacts/
+        CURRENT                  -> "3f2a9c..."
+        3f2a9c.../manifest.json
+        3f2a9c.../feature.npy
+        ...
+
+Arrays are opened with ``np.load(mmap_mode='r')``, so loading costs the
+same whatever the model size and forked workers share the page cache
+instead of each unpickling a private copy. Only NumPy, the standard
+library and ml_model.tree (itself NumPy-only) are imported here.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .tree import TREE_ARRAYS
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+CURRENT = "CURRENT"
+
+VOCABULARY_ARRAYS = (
+    "career_labels",
+    "education_classes",
+    "work_style_classes",
+    "interest_classes",
+    "skills_list",
+    "interests_list",
+)
+OPTIONAL_ARRAYS = ("interest_classes", "interests_list")
+
+
+class BundleError(Exception):
+    """Raised when a bundle is missing, incomplete or of an unknown format."""
+
+
+def _vocabulary(values: Optional[Sequence[str]]) -> Optional[np.ndarray]:
+    if values is None:
+        return None
+    # Fixed-width unicode keeps the array mmappable (no object dtype)
+    return np.asarray([str(v) for v in values], dtype=np.str_)
+
+
+def build_arrays(tree_arrays: Dict[str, np.ndarray], career_labels: Sequence[str],
+                 education_classes: Sequence[str], work_style_classes: Sequence[str],
+                 interest_classes: Optional[Sequence[str]], skills_list: Sequence[str],
+                 interests_list: Optional[Sequence[str]]) -> Dict[str, np.ndarray]:
+    """Collect everything serving needs into the bundle's array layout."""
+    arrays = {name: np.ascontiguousarray(tree_arrays[name]) for name in TREE_ARRAYS}
+    vocabularies = {
+        "career_labels": career_labels,
+        "education_classes": education_classes,
+        "work_style_classes": work_style_classes,
+        "interest_classes": interest_classes,
+        "skills_list": skills_list,
+        "interests_list": interests_list,
+    }
+    for name, values in vocabularies.items():
+        array = _vocabulary(values)
+        if array is not None:
+            arrays[name] = array
+    return arrays
+
+
+def content_hash(arrays: Dict[str, np.ndarray]) -> str:
+    digest = hashlib.sha256()
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(name.encode())
+        digest.update(array.dtype.str.encode())
+        digest.update(repr(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def write_bundle(root: str, arrays: Dict[str, np.ndarray], build_id: Optional[str] = None,
+                 metadata: Optional[Dict] = None, activate: bool = True,
+                 build_hash: Optional[str] = None) -> str:
+    """Write ``arrays`` as a new bundle under ``root`` and return its build id.
+
+    ``build_hash`` identifies the inputs the bundle was built from (see
+    training.build_hash); when given it also names the bundle, so a later
+    build with the same inputs can find it with find_build().
+
+    The bundle is assembled in a temporary directory and renamed into place,
+    then ``CURRENT`` is switched with an atomic ``os.replace``; readers see
+    either the old bundle or the complete new one.
+    """
+    missing = [name for name in TREE_ARRAYS + VOCABULARY_ARRAYS
+               if name not in arrays and name not in OPTIONAL_ARRAYS]
+    if missing:
+        raise BundleError(f"Bundle is missing arrays: {', '.join(missing)}")
+
+    build_id = build_id or (build_hash or content_hash(arrays))[:16]
+    os.makedirs(root, exist_ok=True)
+    final_dir = os.path.join(root, build_id)
+
+    if not os.path.isdir(final_dir):
+        staging = tempfile.mkdtemp(prefix=f".{build_id}-", dir=root)
+        try:
+            entries = {}
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                filename = f"{name}.npy"
+                np.save(os.path.join(staging, filename), array, allow_pickle=False)
+                entries[name] = {
+                    "file": filename,
+                    "dtype": array.dtype.str,
+                    "shape": list(array.shape),
+                    "sha256": hashlib.sha256(array.tobytes()).hexdigest(),
+                }
+            manifest = {
+                "format_version": FORMAT_VERSION,
+                "build_id": build_id,
+                "build_hash": build_hash,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "model": {
+                    "type": "decision_tree",
+                    "n_nodes": int(arrays["feature"].shape[0]),
+                    "n_features": 3 + len(arrays["skills_list"]),
+                },
+                "metadata": metadata or {},
+                "arrays": entries,
+            }
+            with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+            os.rename(staging, final_dir)
+        except FileExistsError:
+            # Another writer produced the same content first
+            shutil.rmtree(staging, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    if activate:
+        activate_bundle(root, build_id)
+    return build_id
+
+
+def activate_bundle(root: str, build_id: str) -> None:
+    """Point ``CURRENT`` at an existing bundle."""
+    if not os.path.isfile(os.path.join(root, build_id, MANIFEST)):
+        raise BundleError(f"No bundle {build_id!r} under {root}")
+    tmp_path = os.path.join(root, f".{CURRENT}.{uuid.uuid4().hex}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(build_id + "\n")
+    os.replace(tmp_path, os.path.join(root, CURRENT))
+
+
+def current_build_id(root: str) -> Optional[str]:
+    try:
+        with open(os.path.join(root, CURRENT), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def find_build(root: str, build_hash: str) -> Optional[str]:
+    """Build id of an existing bundle built from ``build_hash``, if any."""
+    build_id = build_hash[:16]
+    try:
+        manifest = read_manifest(os.path.join(root, build_id))
+    except BundleError:
+        return None
+    return build_id if manifest.get("build_hash") == build_hash else None
+
+
+def read_manifest(bundle_dir: str) -> Dict:
+    try:
+        with open(os.path.join(bundle_dir, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise BundleError(f"Bundle manifest not found: {os.path.join(bundle_dir, MANIFEST)}")
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise BundleError(
+            f"Unsupported bundle format {manifest.get('format_version')!r} in {bundle_dir}"
+        )
+    return manifest
+
+
+def load_bundle(bundle_dir: str, mmap_mode: Optional[str] = "r"):
+    """Return ``(manifest, arrays)`` with every array memory-mapped read-only."""
+    manifest = read_manifest(bundle_dir)
+    arrays = {}
+    for name, entry in manifest["arrays"].items():
+        array = np.load(os.path.join(bundle_dir, entry["file"]), mmap_mode=mmap_mode, allow_pickle=False)
+        if array.dtype.str != entry["dtype"] or list(array.shape) != entry["shape"]:
+            raise BundleError(f"Array {name!r} in {bundle_dir} does not match the manifest")
+        arrays[name] = array
+    return manifest, arrays
+
+
+def convert_pickles(source_dir: str, root: str, activate: bool = True) -> str:
+    """Build a bundle from the legacy pickle artifacts in ``source_dir``.
+
+    Unpickling needs the libraries the pickles were written with (sklearn);
+    the resulting bundle does not.
+    """
+    import pickle
+
+    from .tree import export_tree
+
+    def _load(filename, required=True):
+        path = os.path.join(source_dir, filename)
+        if not os.path.exists(path):
+            if required:
+                raise BundleError(f"Required model file not found: {path}")
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    tree_path = os.path.join(source_dir, "compiled_tree.npz")
+    if os.path.exists(tree_path):
+        with np.load(tree_path, allow_pickle=False) as npz:
+            tree_arrays = {name: npz[name] for name in TREE_ARRAYS}
+    else:
+        tree_arrays = export_tree(_load("trained_model.pkl"))
+
+    interest_encoder = _load("interest_encoder.pkl", required=False)
+    arrays = build_arrays(
+        tree_arrays,
+        career_labels=list(_load("label_encoder.pkl").classes_),
+        education_classes=list(_load("education_encoder.pkl").classes_),
+        work_style_classes=list(_load("work_style_encoder.pkl").classes_),
+        interest_classes=list(interest_encoder.classes_) if interest_encoder is not None else None,
+        skills_list=list(_load("skills_list.pkl")),
+        interests_list=_load("interests_list.pkl", required=False),
+    )
+    return write_bundle(root, arrays, metadata={"converted_from": "pickles"}, activate=activate)
@@ -0,0 +1,145 @@
+"""Seeded, streaming generator for the synthetic training set.
+
+Rows are laid out career by career (``rows_per_career`` rows each, in
+CAREER_REQUIREMENTS order) and cut into fixed-size chunks. Every chunk is
+generated from its own ``SeedSequence([seed, chunk_index])``, so the
+output is identical whatever the number of worker processes, and chunks
+are written as soon as they are ready: memory is bounded by
+``chunk_size`` times the number of chunks in flight, not by the dataset.
+"""
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["skills", "interest", "education", "work_style", "career"]
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Each example lists between MIN_SKILLS and MAX_SKILLS of the career's required skills
+MIN_SKILLS = 2
+MAX_SKILLS = 5
+
+
+def _choice(rng: np.random.Generator, options: List[str], n: int) -> np.ndarray:
+    return np.asarray(options, dtype=object)[rng.integers(0, len(options), n)]
+
+
+def _career_rows(rng: np.random.Generator, career: str, details: Dict, n: int) -> Dict[str, np.ndarray]:
+    required = np.asarray(details["required_skills"], dtype=object)
+    counts = np.minimum(rng.integers(MIN_SKILLS, MAX_SKILLS + 1, n), len(required))
+    # A random permutation per row; its first `count` entries are the sample
+    order = np.argsort(rng.random((n, len(required))), axis=1)
+    skills = [", ".join(required[row[:count]]) for row, count in zip(order, counts)]
+    return {
+        "skills": np.asarray(skills, dtype=object),
+        "interest": _choice(rng, details["interests"], n),
+        "education": _choice(rng, details["education"], n),
+        "work_style": _choice(rng, details["work_style"], n),
+        "career": np.full(n, career, dtype=object),
+    }
+
+
+def generate_chunk(requirements: Dict[str, Dict], rows_per_career: int, seed: int,
+                   chunk_index: int, chunk_size: int) -> pd.DataFrame:
+    """Rows ``[chunk_index * chunk_size, (chunk_index + 1) * chunk_size)`` of the dataset."""
+    careers = list(requirements)
+    total = len(careers) * rows_per_career
+    start = chunk_index * chunk_size
+    stop = min(start + chunk_size, total)
+    rng = np.random.default_rng(np.random.SeedSequence([seed, chunk_index]))
+
+    parts = []
+    row = start
+    while row < stop:
+        career_index = row // rows_per_career
+        # Rows of this career that fall inside the chunk
+        n = min(stop, (career_index + 1) * rows_per_career) - row
+        career = careers[career_index]
+        parts.append(pd.DataFrame(_career_rows(rng, career, requirements[career], n), columns=COLUMNS))
+        row += n
+
+    if not parts:
+        return pd.DataFrame(columns=COLUMNS)
+    return pd.concat(parts, ignore_index=True)
+
+
+def _generate_chunk(args) -> pd.DataFrame:
+    return generate_chunk(*args)
+
+
+def iter_chunks(requirements: Dict[str, Dict], rows_per_career: int = 25, seed: int = 42,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1) -> Iterator[pd.DataFrame]:
+    """Yield the dataset chunk by chunk, in order, generating up to ``workers`` chunks in parallel."""
+    if rows_per_career < 1 or chunk_size < 1:
+        raise ValueError("rows_per_career and chunk_size must be at least 1")
+    total = len(requirements) * rows_per_career
+    tasks = [(requirements, rows_per_career, seed, index, chunk_size)
+             for index in range((total + chunk_size - 1) // chunk_size)]
+
+    if workers <= 1:
+        for task in tasks:
+            yield _generate_chunk(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded window in flight so finished chunks never pile up in memory
+        window = 2 * workers
+        pending = [executor.submit(_generate_chunk, task) for task in tasks[:window]]
+        next_task = len(pending)
+        while pending:
+            chunk = pending.pop(0).result()
+            if next_task < len(tasks):
+                pending.append(executor.submit(_generate_chunk, tasks[next_task]))
+                next_task += 1
+            yield chunk
+
+
+def write_dataset(path: str, requirements: Dict[str, Dict], rows_per_career: int = 25, seed: int = 42,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1) -> int:
+    """Stream the dataset to a CSV file (gzip if ``path`` ends in .gz) and return the row count.
+
+    The file is written next to ``path`` and renamed into place at the end,
+    so readers never see a partial dataset.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    suffix = ".csv.gz" if path.endswith(".gz") else ".csv"
+    fd, tmp_path = tempfile.mkstemp(prefix=".dataset-", suffix=suffix, dir=directory)
+    os.close(fd)
+
+    rows = 0
+    try:
+        for index, chunk in enumerate(iter_chunks(requirements, rows_per_career, seed, chunk_size, workers)):
+            chunk.to_csv(tmp_path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+            rows += len(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return rows
+
+
+def read_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Read a dataset written by write_dataset() back in ``chunk_size`` row chunks."""
+    yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+
+def class_vocabularies(requirements: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """Every value the generator can emit per categorical column, sorted like LabelEncoder.classes_.
+
+    Fitting the encoders on these instead of on the data lets chunks be
+    encoded independently.
+    """
+    def _values(key: str) -> List[str]:
+        return sorted({value for details in requirements.values() for value in details[key]})
+
+    return {
+        "career": sorted(requirements),
+        "interest": _values("interests"),
+        "education": _values("education"),
+        "work_style": _values("work_style"),
+    }
@@ -0,0 +1,114 @@
+"""Lazy entry point to the ML stack.
+
+Importing this module costs nothing beyond the standard library and Django
+settings: NumPy, the artifact registry and the prediction code are only
+imported on the first prediction (or by preload()). Management commands
+such as migrate therefore never load the model, while serving processes
+call preload() from the WSGI entry point when ``ML_PRELOAD`` is enabled.
+"""
+import importlib
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_modules = None
+_import_error: Optional[Exception] = None
+_batcher = None
+
+
+def _load():
+    """Import the heavy modules once; return them as a dict or None if unavailable."""
+    global _modules, _import_error
+    if _modules is not None or _import_error is not None:
+        return _modules
+    with _lock:
+        if _modules is None and _import_error is None:
+            try:
+                _modules = {
+                    "predict": importlib.import_module("ml_model.predict"),
+                    "batching": importlib.import_module("ml_model.batching"),
+                }
+            except ImportError as e:
+                logger.warning("ML model not available (%s); using mock recommendations instead", e)
+                _import_error = e
+    return _modules
+
+
+def is_loaded() -> bool:
+    """True once the ML modules have been imported (does not trigger the import)."""
+    return _modules is not None
+
+
+def is_available() -> bool:
+    return _load() is not None
+
+
+def preload() -> Dict:
+    """Import the ML stack and warm the model now instead of on first use."""
+    from .health import warm_up
+
+    return warm_up()
+
+
+def _batching_config() -> Dict:
+    config = {'ENABLED': False, 'MAX_BATCH_SIZE': 32, 'MAX_WAIT_MS': 2, 'TIMEOUT_SECONDS': 10}
+    config.update(getattr(settings, 'ML_MICRO_BATCHING', {}))
+    return config
+
+
+def get_batcher():
+    """Process-wide MicroBatcher, created on first use (None when disabled)."""
+    global _batcher
+    config = _batching_config()
+    modules = _load()
+    if modules is None or not config['ENABLED']:
+        return None
+    if _batcher is None:
+        with _lock:
+            if _batcher is None:
+                _batcher = modules["batching"].MicroBatcher(
+                    modules["predict"].predict_careers_batch,
+                    max_batch_size=config['MAX_BATCH_SIZE'],
+                    max_wait_ms=config['MAX_WAIT_MS'],
+                )
+    return _batcher
+
+
+def predict_careers(assessment_data: Dict, top_k: int = 5) -> List[Dict]:
+    modules = _load()
+    if modules is None:
+        raise _import_error
+    return modules["predict"].predict_careers(assessment_data, top_k=top_k)
+
+
+def predict_careers_batch(assessments: Sequence[Dict], top_k: int = 5) -> List[List[Dict]]:
+    modules = _load()
+    if modules is None:
+        raise _import_error
+    return modules["predict"].predict_careers_batch(assessments, top_k=top_k)
+
+
+def run_prediction(assessment_data: Dict, top_k: int = 5) -> List[Dict]:
+    """Score one assessment, through the micro-batcher when it is enabled."""
+    batcher = get_batcher()
+    if batcher is None:
+        return predict_careers(assessment_data, top_k=top_k)
+    return batcher.predict(assessment_data, top_k, timeout=_batching_config()['TIMEOUT_SECONDS'])
+
+
+def model_version() -> Optional[str]:
+    """Fingerprint of the artifacts predictions are currently served from (None if unavailable)."""
+    modules = _load()
+    if modules is None:
+        return None
+    return modules["predict"].get_artifacts().fingerprint
+
+
+def inference_stats() -> Optional[Dict]:
+    """Throughput/latency counters of the micro-batcher, if it has been used."""
+    return _batcher.stats() if _batcher is not None else None
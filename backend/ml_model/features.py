@@ -0,0 +1,114 @@
+"""Vectorized feature construction for training.
+
+Skills are multi-hot encoded straight into a ``scipy.sparse`` CSR matrix:
+the skill strings are split once, every token is looked up in the
+vocabulary with a single pandas indexer call and the (row, column) pairs
+become the matrix. Tokens must match a vocabulary entry exactly, the same
+rule predict._encode_features applies at serving time.
+"""
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+SKILL_SEPARATOR = ", "
+
+# Column order the model is trained on and predict.py serves with
+CATEGORICAL_COLUMNS = ["education_encoded", "work_style_encoded", "interest_encoded"]
+
+
+def skill_vocabulary(skills_by_category) -> list:
+    """Sorted, de-duplicated skill names from SKILLS_LIST."""
+    return sorted({skill for skills in skills_by_category.values() for skill in skills})
+
+
+def _split(value) -> list:
+    if isinstance(value, str):
+        return value.split(SKILL_SEPARATOR)
+    return list(value) if value is not None else []
+
+
+def encode_skills(skills: Union[pd.Series, Iterable], vocabulary: Sequence[str],
+                  dtype=np.float32) -> sparse.csr_matrix:
+    """Multi-hot encode one skill collection per row into an (n_rows, len(vocabulary)) CSR matrix.
+
+    Rows may be ``", "``-joined strings (training_data.csv) or lists of
+    skill names (Assessment.skills). Unknown skills are ignored and
+    duplicates within a row count once.
+
+    Real and synthetic data repeat the same skill combinations many times,
+    so each distinct row is encoded once and the result is gathered back
+    to every row by its factorized code.
+    """
+    series = skills if isinstance(skills, pd.Series) else pd.Series(list(skills), dtype=object)
+    if pd.api.types.infer_dtype(series, skipna=True) != "string":
+        # Lists are unhashable; key them by their sorted, de-duplicated contents
+        series = series.map(lambda value: SKILL_SEPARATOR.join(sorted(set(_split(value)))))
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+
+    columns_by_skill = {skill: column for column, skill in enumerate(vocabulary)}
+    indptr = [0]
+    indices = []
+    for value in uniques:
+        row = {columns_by_skill.get(token.strip()) for token in _split(value)}
+        row.discard(None)
+        indices.extend(sorted(row))
+        indptr.append(len(indices))
+    # Missing values (code -1) map to a trailing empty row
+    indptr.append(len(indices))
+
+    distinct = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=dtype), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(uniques) + 1, len(vocabulary)),
+    )
+    codes = np.where(codes < 0, len(uniques), codes)
+    return distinct[codes]
+
+
+def encode_labels(values: pd.Series, classes: Sequence[str]) -> np.ndarray:
+    """Like LabelEncoder.transform against fixed ``classes``; unknown values map to 0 as in predict.py."""
+    codes = pd.Index(classes).get_indexer(values.astype(str).str.strip())
+    return np.where(codes < 0, 0, codes)
+
+
+def encode_frame(frame: pd.DataFrame, vocabularies: Dict[str, Sequence[str]],
+                 skills: Sequence[str]) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """Encode one dataset chunk into ``(X, y)`` using fixed vocabularies.
+
+    Because the vocabularies are fixed up front, chunks can be encoded
+    independently and stacked with ``scipy.sparse.vstack``.
+    """
+    categorical = np.column_stack([
+        encode_labels(frame["education"], vocabularies["education"]),
+        encode_labels(frame["work_style"], vocabularies["work_style"]),
+        encode_labels(frame["interest"], vocabularies["interest"]),
+    ])
+    X = build_feature_matrix(categorical, encode_skills(frame["skills"], skills))
+    return X, encode_labels(frame["career"], vocabularies["career"])
+
+
+def encode_one_hot(frame: pd.DataFrame, vocabularies: Dict[str, Sequence[str]],
+                   skills: Sequence[str], dtype=np.float32) -> sparse.csr_matrix:
+    """One-hot categoricals followed by the multi-hot skills, for linear models.
+
+    Label codes suit trees, which split on thresholds; a linear model needs
+    one column per education level, work style and interest.
+    """
+    blocks = []
+    for column in ("education", "work_style", "interest"):
+        classes = vocabularies[column]
+        codes = pd.Index(classes).get_indexer(frame[column].astype(str).str.strip())
+        rows = np.flatnonzero(codes >= 0)
+        blocks.append(sparse.csr_matrix(
+            (np.ones(len(rows), dtype=dtype), (rows, codes[rows])), shape=(len(frame), len(classes))
+        ))
+    blocks.append(encode_skills(frame["skills"], skills, dtype=dtype))
+    return sparse.hstack(blocks, format="csr", dtype=dtype)
+
+
+def build_feature_matrix(categorical: np.ndarray, skill_matrix: sparse.csr_matrix,
+                         dtype=np.float32) -> sparse.csr_matrix:
+    """Prepend the encoded categorical columns to the skill matrix."""
+    categorical = sparse.csr_matrix(np.asarray(categorical, dtype=dtype))
+    return sparse.hstack([categorical, skill_matrix], format="csr", dtype=dtype)
@@ -0,0 +1,100 @@
+"""Model warm-up and the state reported by the health endpoints."""
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Exercises encoding, tree evaluation and skill-gap analysis end to end
+WARMUP_ASSESSMENT = {
+    "skills": ["Programming", "Data Analysis", "Communication"],
+    "interests": ["Technology & Innovation", "Problem Solving"],
+    "education": "Bachelor's Degree",
+    "work_style": "Remote",
+}
+
+_lock = threading.Lock()
+_state: Dict = {
+    "status": "cold",
+    "error": None,
+    "warmup_ms": None,
+    "warmed_at": None,
+}
+
+
+def _registry():
+    # Imported on demand so the probes stay cheap until the ML stack is loaded
+    from .registry import registry
+    return registry
+
+
+def warm_up() -> Dict:
+    """Load the artifacts and run one prediction so no request pays for it.
+
+    Never raises; failures are logged and reported by readiness().
+    """
+    with _lock:
+        _state.update(status="warming", error=None)
+        started = time.perf_counter()
+        try:
+            from .predict import predict_careers
+
+            registry = _registry()
+            registry.get()
+            predict_careers(WARMUP_ASSESSMENT)
+        except Exception as e:
+            logger.warning("Model warm-up failed: %s", e)
+            _state.update(status="failed", error=str(e))
+        else:
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+            _state.update(status="ready", warmup_ms=elapsed_ms, warmed_at=time.time())
+            logger.info("Model warm-up finished in %.1fms (%s)", elapsed_ms, registry.fingerprint)
+        return dict(_state)
+
+
+def _model_info() -> Optional[Dict]:
+    if is_cold():
+        return None
+    registry = _registry()
+    artifacts = registry.peek()
+    if artifacts is None:
+        return None
+    return {
+        "fingerprint": artifacts.fingerprint,
+        "build_id": artifacts.build_id,
+        "build_hash": artifacts.build_hash,
+        "version": artifacts.version,
+        "loaded_at": artifacts.loaded_at,
+        "load_ms": round(artifacts.load_seconds * 1000, 3),
+        "shared_memory": registry.shared_memory_name,
+    }
+
+
+def readiness() -> Tuple[bool, Dict]:
+    """(ready, payload): ready once warm-up succeeded and a model is loaded."""
+    model = _model_info()
+    ready = _state["status"] == "ready" and model is not None
+    return ready, {
+        "status": "ready" if ready else _state["status"],
+        "model": model,
+        "warmup": {
+            "latency_ms": _state["warmup_ms"],
+            "completed_at": _state["warmed_at"],
+            "error": _state["error"],
+        },
+    }
+
+
+def is_cold() -> bool:
+    return _state["status"] == "cold"
+
+
+def needs_warm_up() -> bool:
+    """Nothing attempted yet, or the last attempt failed (artifacts may since have appeared)."""
+    return _state["status"] in ("cold", "failed")
+
+
+def liveness() -> Dict:
+    model_loaded = not is_cold() and _registry().is_loaded()
+    return {"status": "alive", "model_loaded": model_loaded}
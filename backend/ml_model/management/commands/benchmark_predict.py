@@ -0,0 +1,64 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from ml_model.career_data import CAREER_REQUIREMENTS, SKILLS_LIST
+from ml_model.predict import leaf_cache, predict_careers, predict_careers_batch, prediction_cache
+
+
+def sample_assessments(count, seed=0):
+    """Build realistic assessment dicts from the career catalog."""
+    rng = random.Random(seed)
+    all_skills = sorted({skill for cat in SKILLS_LIST.values() for skill in cat})
+    careers = list(CAREER_REQUIREMENTS.values())
+    assessments = []
+    for _ in range(count):
+        details = rng.choice(careers)
+        skills = rng.sample(details["required_skills"], rng.randint(2, len(details["required_skills"])))
+        skills += rng.sample(all_skills, rng.randint(1, 3))
+        assessments.append({
+            "skills": skills,
+            "interests": rng.sample(details["interests"], len(details["interests"])),
+            "education": rng.choice(details["education"]),
+            "work_style": rng.choice(details["work_style"]),
+        })
+    return assessments
+
+
+class Command(BaseCommand):
+    help = "Compare rows/sec of predict_careers (one call per row) and predict_careers_batch"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Number of assessments to score")
+        parser.add_argument("--top-k", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        top_k = options["top_k"]
+        assessments = sample_assessments(rows, seed=options["seed"])
+
+        # Load artifacts outside the timed sections; time cold (uncached) scoring
+        predict_careers(assessments[0], top_k=top_k)
+        prediction_cache.clear()
+        leaf_cache.clear()
+
+        started = time.perf_counter()
+        single = [predict_careers(a, top_k=top_k) for a in assessments]
+        single_seconds = time.perf_counter() - started
+
+        prediction_cache.clear()
+        leaf_cache.clear()
+        started = time.perf_counter()
+        batch = predict_careers_batch(assessments, top_k=top_k)
+        batch_seconds = time.perf_counter() - started
+
+        if single != batch:
+            self.stderr.write(self.style.ERROR("Batch results differ from per-row results"))
+
+        self.stdout.write(f"rows:                  {rows}")
+        self.stdout.write(f"predict_careers:       {rows / single_seconds:,.0f} rows/sec ({single_seconds:.3f}s)")
+        self.stdout.write(f"predict_careers_batch: {rows / batch_seconds:,.0f} rows/sec ({batch_seconds:.3f}s)")
+        self.stdout.write(f"leaf cache entries:    {len(leaf_cache)} distinct signatures")
+        self.stdout.write(self.style.SUCCESS(f"speedup: {single_seconds / batch_seconds:.1f}x"))
@@ -0,0 +1,34 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ml_model.bundle import BundleError, convert_pickles
+from ml_model.registry import ARTIFACT_DIR, BUNDLE_ROOT
+
+
+class Command(BaseCommand):
+    help = "Convert the legacy pickle artifacts into a memory-mappable artifact bundle"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source", default=ARTIFACT_DIR,
+            help="Directory holding trained_model.pkl, label_encoder.pkl, ... (default: the ml_model app)",
+        )
+        parser.add_argument(
+            "--output", default=os.path.join(ARTIFACT_DIR, BUNDLE_ROOT),
+            help="Bundle root to write into (default: ml_model/artifacts)",
+        )
+        parser.add_argument(
+            "--no-activate", action="store_true",
+            help="Write the bundle without pointing CURRENT at it",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            build_id = convert_pickles(options["source"], options["output"], activate=not options["no_activate"])
+        except BundleError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote bundle {build_id} to {os.path.join(options['output'], build_id)}"
+        ))
@@ -0,0 +1,41 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ml_model.career_data import CAREER_REQUIREMENTS
+from ml_model.dataset import DEFAULT_CHUNK_SIZE, write_dataset
+from ml_model.registry import ARTIFACT_DIR
+
+
+class Command(BaseCommand):
+    help = "Stream the seeded synthetic training set to CSV in fixed-size chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output", default=os.path.join(ARTIFACT_DIR, "training_data.csv"),
+            help="CSV file to write; a .gz suffix compresses it (default: ml_model/training_data.csv)",
+        )
+        parser.add_argument("--rows-per-career", type=int, default=25)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="Processes generating chunks in parallel")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            rows = write_dataset(
+                options["output"], CAREER_REQUIREMENTS,
+                rows_per_career=options["rows_per_career"],
+                seed=options["seed"],
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {rows} rows to {options['output']} in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)"
+        ))
@@ -0,0 +1,75 @@
+import json
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+HEAVY_MODULES = ("numpy", "scipy", "pandas", "sklearn")
+
+# Runs in a fresh interpreter so nothing is already imported
+STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+import recommendations.services
+setup_seconds = time.perf_counter() - started
+if {wsgi}:
+    import career_api.wsgi
+print(json.dumps({{
+    "setup_seconds": setup_seconds,
+    "total_seconds": time.perf_counter() - started,
+    "modules": len(sys.modules),
+    "heavy": sorted(m for m in {heavy!r} if m in sys.modules),
+}}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class Command(BaseCommand):
+    help = "Measure cold start: time django.setup() in a fresh interpreter with -X importtime"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=15,
+                            help="Number of slowest top-level imports to list")
+        parser.add_argument("--wsgi", action="store_true",
+                            help="Also import career_api.wsgi (includes ML_PRELOAD warm-up)")
+        parser.add_argument("--preload", choices=("0", "1"),
+                            help="Override ML_PRELOAD for the measured process")
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            "DJANGO_SETTINGS_MODULE", "career_api.settings"))
+        if options["preload"] is not None:
+            env["ML_PRELOAD"] = options["preload"]
+
+        script = STARTUP_SCRIPT.format(wsgi=options["wsgi"], heavy=HEAVY_MODULES)
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            cwd=str(settings.BASE_DIR), env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "startup failed")
+
+        summary = json.loads(proc.stdout.strip().splitlines()[-1])
+        top_level = []
+        for line in proc.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            # importtime indents nested imports; only unindented rows are top level
+            if match and len(match.group(3)) == 1:
+                top_level.append((int(match.group(2)), match.group(4)))
+        top_level.sort(reverse=True)
+
+        self.stdout.write(f"django.setup() + services import: {summary['setup_seconds'] * 1000:.1f}ms")
+        if options["wsgi"]:
+            self.stdout.write(f"including WSGI entry point:       {summary['total_seconds'] * 1000:.1f}ms")
+        self.stdout.write(f"modules loaded: {summary['modules']}")
+        heavy = ", ".join(summary["heavy"]) or "none"
+        self.stdout.write(f"heavy ML modules imported: {heavy}")
+        self.stdout.write("\nslowest top-level imports (cumulative):")
+        for cumulative_us, module in top_level[:options["top"]]:
+            self.stdout.write(f"  {cumulative_us / 1000:9.1f}ms  {module}")
@@ -0,0 +1,83 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ml_model.dataset import DEFAULT_CHUNK_SIZE
+from ml_model.registry import ARTIFACT_DIR, BUNDLE_ROOT
+from ml_model.training import candidate_grid, generate_and_train, train_and_write
+
+
+class Command(BaseCommand):
+    help = (
+        "Search decision-tree hyperparameters in parallel, pick the most accurate model "
+        "within a per-prediction latency budget and write it as the active artifact bundle"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--data",
+            help="Existing training CSV (see generate_training_data); generated when omitted",
+        )
+        parser.add_argument(
+            "--output", default=os.path.join(ARTIFACT_DIR, BUNDLE_ROOT),
+            help="Bundle root to write into (default: ml_model/artifacts)",
+        )
+        parser.add_argument("--rows-per-career", type=int, default=25)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--jobs", type=int, default=-1,
+                            help="Parallel search/generation processes (-1: all cores)")
+        parser.add_argument("--latency-budget-ms", type=float, default=1.0,
+                            help="Maximum median latency of one single-row prediction")
+        parser.add_argument("--test-size", type=float, default=0.2)
+        parser.add_argument("--no-activate", action="store_true",
+                            help="Write the bundle without pointing CURRENT at it")
+        parser.add_argument("--force", action="store_true",
+                            help="Retrain even if a bundle with the same build hash exists")
+
+    def handle(self, *args, **options):
+        common = {
+            "candidates": candidate_grid(),
+            "latency_budget_ms": options["latency_budget_ms"],
+            "n_jobs": options["jobs"],
+            "test_size": options["test_size"],
+            "seed": options["seed"],
+            "chunk_size": options["chunk_size"],
+            "activate": not options["no_activate"],
+            "force": options["force"],
+        }
+        started = time.perf_counter()
+        try:
+            if options["data"]:
+                outcome = train_and_write(options["data"], options["output"], **common)
+            else:
+                outcome = generate_and_train(
+                    os.path.join(ARTIFACT_DIR, "training_data.csv"), options["output"],
+                    rows_per_career=options["rows_per_career"],
+                    workers=os.cpu_count() if options["jobs"] < 1 else options["jobs"],
+                    **common,
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if outcome["cached"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"Bundle {outcome['build_id']} is up to date (build hash {outcome['build_hash'][:16]}); "
+                f"skipped training"
+            ))
+            return
+
+        self.stdout.write(f"{'accuracy':>9} {'latency ms':>11} {'fit s':>8} {'nodes':>6}  params")
+        for result in sorted(outcome["results"], key=lambda r: (-r["accuracy"], r["latency_ms_per_row"])):
+            marker = "*" if result is outcome["selected"] else " "
+            self.stdout.write(
+                f"{result['accuracy']:>9.4f} {result['latency_ms_per_row']:>11.4f} "
+                f"{result['fit_seconds']:>8.3f} {result['n_nodes']:>6}{marker} {result['params']}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Trained on {outcome['rows']} rows in {time.perf_counter() - started:.1f}s; "
+            f"bundle {outcome['build_id']} written to {options['output']}"
+            f" (build hash {outcome['build_hash'][:16]})"
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from ml_model.online import DEFAULT_CHUNK_SIZE, checkpoint_path, update_from_assessments
+
+
+class Command(BaseCommand):
+    help = (
+        "Update the online career model with assessments stored since the last checkpoint "
+        "(cost is proportional to the new rows only)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                            help="Assessments fetched and learned from per step")
+        parser.add_argument("--reset", action="store_true",
+                            help="Ignore the checkpoint and start over from the first assessment")
+
+    def handle(self, *args, **options):
+        state = update_from_assessments(chunk_size=options["chunk_size"], reset=options["reset"])
+
+        if not state["rows"]:
+            self.stdout.write(f"No new labelled assessments after #{state['last_assessment_id']}")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Learned from {state['rows']} assessments (up to #{state['last_assessment_id']}, "
+            f"{state['rows_seen']} in total, {state['skipped']} skipped); "
+            f"progressive accuracy {state['accuracy']:.2%}. Checkpoint: {checkpoint_path()}"
+        ))
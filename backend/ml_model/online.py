@@ -0,0 +1,217 @@
+"""Incremental model updates from stored assessments.
+
+OnlineSoftmaxClassifier is a multinomial logistic regression trained
+with mini-batch SGD through partial_fit(), so each update costs time
+proportional to the new rows only. Its whole state is a few NumPy arrays.
+The checkpoint (``ARTIFACT_DIR/online/checkpoint.npz``) holds that state
+and the id of the last assessment consumed, and is replaced atomically
+after every chunk, so an interrupted run resumes where it stopped.
+
+Assessments carry no ground-truth career. Each row is labelled with the
+career ranked first by the model that served it (pseudo-labelling). Rows
+served mock recommendations (no model was loaded) and rows whose top
+career is outside the catalog are skipped.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .career_data import CAREER_REQUIREMENTS, SKILLS_LIST
+from .dataset import class_vocabularies
+from .features import encode_labels, encode_one_hot, skill_vocabulary
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = "online"
+CHECKPOINT_FILE = "checkpoint.npz"
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class OnlineSoftmaxClassifier:
+    """Multinomial logistic regression updated one mini-batch at a time."""
+
+    def __init__(self, n_features: int, classes: Sequence[str], learning_rate: float = 0.5,
+                 alpha: float = 1e-4):
+        self.classes = np.asarray(classes, dtype=np.str_)
+        self.coef = np.zeros((n_features, len(self.classes)), dtype=np.float64)
+        self.intercept = np.zeros(len(self.classes), dtype=np.float64)
+        self.learning_rate = learning_rate
+        self.alpha = alpha
+        # Mini-batches seen; drives the decaying step size
+        self.steps = 0
+
+    def decision_function(self, X) -> np.ndarray:
+        return np.asarray(X @ self.coef) + self.intercept
+
+    def predict_proba(self, X) -> np.ndarray:
+        scores = self.decision_function(X)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, X) -> np.ndarray:
+        return np.argmax(self.decision_function(X), axis=1)
+
+    def partial_fit(self, X, y: np.ndarray, batch_size: int = 64) -> "OnlineSoftmaxClassifier":
+        """SGD over ``(X, y)`` in mini-batches of ``batch_size``; ``y`` holds class indices."""
+        for start in range(0, X.shape[0], batch_size):
+            self._step(X[start:start + batch_size], y[start:start + batch_size])
+        return self
+
+    def _step(self, X, y: np.ndarray) -> None:
+        n = X.shape[0]
+        gradient = self.predict_proba(X)
+        gradient[np.arange(n), y] -= 1.0
+        gradient /= n
+
+        step = self.learning_rate / np.sqrt(1.0 + self.steps)
+        self.coef -= step * (np.asarray(X.T @ gradient) + self.alpha * self.coef)
+        self.intercept -= step * gradient.sum(axis=0)
+        self.steps += 1
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "coef": self.coef,
+            "intercept": self.intercept,
+            "classes": self.classes,
+            "hyperparameters": np.array([self.learning_rate, self.alpha, self.steps], dtype=np.float64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "OnlineSoftmaxClassifier":
+        learning_rate, alpha, steps = arrays["hyperparameters"]
+        model = cls(arrays["coef"].shape[0], arrays["classes"], learning_rate=learning_rate, alpha=alpha)
+        model.coef = np.array(arrays["coef"], dtype=np.float64)
+        model.intercept = np.array(arrays["intercept"], dtype=np.float64)
+        model.steps = int(steps)
+        return model
+
+
+def checkpoint_path(artifact_dir: Optional[str] = None) -> str:
+    from .registry import ARTIFACT_DIR
+
+    return os.path.join(artifact_dir or ARTIFACT_DIR, CHECKPOINT_DIR, CHECKPOINT_FILE)
+
+
+def save_checkpoint(path: str, model: OnlineSoftmaxClassifier, state: Dict) -> None:
+    """Write model and progress to one file and swap it in with os.replace."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".checkpoint-", suffix=".npz", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, state=np.array(json.dumps(state)), **model.to_arrays())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_checkpoint(path: str) -> Optional[Tuple[OnlineSoftmaxClassifier, Dict]]:
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as arrays:
+        return OnlineSoftmaxClassifier.from_arrays(arrays), json.loads(str(arrays["state"]))
+
+
+def iter_new_assessments(after_id: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Yield assessments with id > ``after_id`` in id order, ``chunk_size`` rows per frame.
+
+    Rows are streamed with QuerySet.iterator(), and the rank-1 career comes
+    from a correlated subquery, so memory stays bounded by one chunk.
+    """
+    from django.db.models import Case, OuterRef, Q, Subquery, When
+
+    from recommendations.models import Assessment, Recommendation
+    from recommendations.services import MOCK_RATIONALE_NOTE
+
+    # The ranking belongs to the assessment or to its shared PredictionResult.
+    # A mock ranking gives no career, so the row is skipped like an unknown one.
+    top = (
+        Recommendation.objects.filter(rank=1)
+        .filter(Q(rationale__note__isnull=True) | ~Q(rationale__note=MOCK_RATIONALE_NOTE))
+        .values("career_name")
+    )
+    top_career = Case(
+        When(prediction_result__isnull=True, then=Subquery(top.filter(assessment=OuterRef("pk"))[:1])),
+        default=Subquery(top.filter(result=OuterRef("prediction_result"))[:1]),
+    )
+    rows = (
+        Assessment.objects.filter(id__gt=after_id)
+        .annotate(career=top_career)
+        .order_by("id")
+        .values_list("id", "skills", "interests", "education_level", "work_style", "career")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    chunk: List[tuple] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield _frame(chunk)
+            chunk = []
+    if chunk:
+        yield _frame(chunk)
+
+
+def _frame(rows: List[tuple]) -> pd.DataFrame:
+    ids, skills, interests, education, work_style, career = zip(*rows)
+    return pd.DataFrame({
+        "id": ids,
+        "skills": list(skills),
+        # Only the first interest is a model feature, as in predict.py
+        "interest": [values[0] if values else "" for values in interests],
+        "education": education,
+        "work_style": work_style,
+        "career": career,
+    })
+
+
+def update_from_assessments(artifact_dir: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                            reset: bool = False) -> Dict:
+    """Feed every assessment newer than the checkpoint through partial_fit().
+
+    Returns the final checkpoint state plus ``rows`` (rows learned from in
+    this run) and ``accuracy`` (how often the model agreed with a label
+    before updating on it, i.e. progressive validation).
+    """
+    vocabularies = class_vocabularies(CAREER_REQUIREMENTS)
+    skills = skill_vocabulary(SKILLS_LIST)
+    n_features = sum(len(vocabularies[c]) for c in ("education", "work_style", "interest")) + len(skills)
+
+    path = checkpoint_path(artifact_dir)
+    loaded = None if reset else load_checkpoint(path)
+    if loaded is not None:
+        model, state = loaded
+    else:
+        model = OnlineSoftmaxClassifier(n_features, vocabularies["career"])
+        state = {"last_assessment_id": 0, "rows_seen": 0, "skipped": 0}
+
+    rows = correct = 0
+    started = time.perf_counter()
+    for frame in iter_new_assessments(state["last_assessment_id"], chunk_size):
+        labelled = frame["career"].isin(vocabularies["career"])
+        batch = frame[labelled]
+        if len(batch):
+            X = encode_one_hot(batch, vocabularies, skills)
+            y = encode_labels(batch["career"], vocabularies["career"])
+            correct += int((model.predict(X) == y).sum())
+            model.partial_fit(X, y)
+            rows += len(batch)
+
+        state["last_assessment_id"] = int(frame["id"].iloc[-1])
+        state["rows_seen"] += int(len(batch))
+        state["skipped"] += int((~labelled).sum())
+        state["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        save_checkpoint(path, model, state)
+
+    logger.info("Online model learned from %d new assessments in %.2fs", rows, time.perf_counter() - started)
+    return dict(state, rows=rows, accuracy=round(correct / rows, 4) if rows else None)
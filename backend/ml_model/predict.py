@@ -1,17 +1,30 @@
-import os
-import pickle
-from typing import List, Dict
+from typing import List, Dict, Sequence, Tuple
 
 import numpy as np
 
+from .cache import MISSING, LRUCache
+from .registry import ArtifactSet, get_artifacts, registry
+from .skill_gap import skill_gap_index
 
-def _load_pickle(filename: str):
-    here = os.path.dirname(__file__)
-    path = os.path.join(here, filename)
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Required model file not found: {path}")
-    with open(path, "rb") as f:
-        return pickle.load(f)
+# Results are deterministic for a given model, so identical (or reordered)
+# submissions are served from memory until the artifacts change.
+PREDICTION_CACHE_SIZE = 4096
+PREDICTION_CACHE_TTL = 3600.0
+
+# The tree only tests a few columns, so many distinct assessments share a
+# ranking. This cache is keyed on the projection onto those columns.
+LEAF_CACHE_SIZE = 4096
+
+prediction_cache = LRUCache(maxsize=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL)
+leaf_cache = LRUCache(maxsize=LEAF_CACHE_SIZE, ttl=None)
+
+
+def _clear_caches(artifacts: ArtifactSet) -> None:
+    prediction_cache.clear()
+    leaf_cache.clear()
+
+
+registry.add_reload_listener(_clear_caches)
 
 
 def _confidence_label(score: float) -> str:
@@ -24,105 +37,114 @@ def _confidence_label(score: float) -> str:
     return "Low"
 
 
-def predict_careers(assessment_data: Dict, top_k: int = 5) -> List[Dict]:
-    """Load ML artifacts and produce career predictions.
+def _first_interest(interests) -> str:
+    # For interests, the training used a single interest value; take first if list
+    if isinstance(interests, (list, tuple)) and len(interests) > 0:
+        return interests[0]
+    if isinstance(interests, str):
+        return interests
+    return ""
 
-    Expects pickles in the same folder as this file:
-      - trained_model.pkl
-      - label_encoder.pkl
-      - education_encoder.pkl
-      - work_style_encoder.pkl
-      - skills_list.pkl
-      - interests_list.pkl  (optional)
 
-    assessment_data should be a dict with keys used elsewhere in the project,
-    for example: { 'skills': [...], 'interests': [...], 'education': '...', 'work_style': '...' }
+def _encode_categoricals(artifacts: ArtifactSet, assessment_data: Dict) -> List[int]:
+    """Encode education, work style and interest the way training did.
 
-    Returns a list of dicts with the keys the code expects in services.create_assessment_with_recommendations
-    (career_name, match_score, confidence_level, rank, matching_skills, missing_skills, completeness_percent).
+    Uses the lookup tables built at load time; unseen values encode to 0.
     """
+    education = str(assessment_data.get("education") or "").strip()
+    work_style = str(assessment_data.get("work_style") or "").strip()
+    interest = str(_first_interest(assessment_data.get("interests"))).strip()
 
-    # Load artifacts
-    model = _load_pickle("trained_model.pkl")
-    label_encoder = _load_pickle("label_encoder.pkl")
-    education_encoder = _load_pickle("education_encoder.pkl")
-    work_style_encoder = _load_pickle("work_style_encoder.pkl")
-    skills_list = _load_pickle("skills_list.pkl")
-    try:
-        interests_list = _load_pickle("interests_list.pkl")
-    except FileNotFoundError:
-        interests_list = None
-
-    # Prepare feature vector in the same order used during training
-    # training_assests.py used: ["education_encoded", "work_style_encoded", "interest_encoded"] + all_skills
-    education = assessment_data.get("education", "")
-    work_style = assessment_data.get("work_style", "")
-    # For interests, the training used a single interest value; take first if list
-    interests = assessment_data.get("interests")
-    interest_val = ""
-    if isinstance(interests, (list, tuple)) and len(interests) > 0:
-        interest_val = interests[0]
-    elif isinstance(interests, str):
-        interest_val = interests
-
-    # Encode categorical fields. If unseen value, try to handle gracefully.
-    try:
-        education_encoded = int(education_encoder.transform([education])[0])
-    except Exception:
-        # fallback to 0 if unseen
-        education_encoded = 0
-    try:
-        work_style_encoded = int(work_style_encoder.transform([work_style])[0])
-    except Exception:
-        work_style_encoded = 0
-    try:
-        if interests_list is not None:
-            interest_encoded = 0
-            if interest_val in interests_list:
-                # if interests_list was saved as the encoder's classes, try to transform
-                try:
-                    interest_encoded = int(education_encoder.transform([interest_val])[0])
-                except Exception:
-                    interest_encoded = 0
-            else:
-                interest_encoded = 0
-        else:
-            interest_encoded = 0
-    except Exception:
-        interest_encoded = 0
-
-    # Build skill features
-    user_skills = set(assessment_data.get("skills") or [])
-    skill_features = [1 if skill in user_skills else 0 for skill in skills_list]
-
-    feature_vector = [education_encoded, work_style_encoded, interest_encoded] + skill_features
-    X = np.array(feature_vector, dtype=float).reshape(1, -1)
-
-    # Predict probabilities if available
-    try:
-        proba = model.predict_proba(X)[0]
-        # proba aligns with label_encoder.classes_
-        indices = np.argsort(proba)[::-1][:top_k]
-        scores = proba[indices]
-        classes = label_encoder.inverse_transform(indices)
-    except Exception:
-        # fallback to single predict (no probability)
-        pred = model.predict(X)[0]
-        classes = label_encoder.inverse_transform([pred])
-        scores = [1.0]
+    return [
+        artifacts.education_index.get(education, 0),
+        artifacts.work_style_index.get(work_style, 0),
+        artifacts.interest_index.get(interest, 0),
+    ]
+
+
+def canonical_key(artifacts: ArtifactSet, assessment_data: Dict, top_k: int) -> Tuple:
+    """Cache key holding exactly the inputs that influence predict_careers.
+
+    Skills are a set, so their order is irrelevant; only the first interest
+    is used by the model and the other fields are whitespace-normalised the
+    same way _encode_categoricals does.
+    """
+    return (
+        artifacts.fingerprint,
+        top_k,
+        tuple(sorted(set(assessment_data.get("skills") or []))),
+        str(_first_interest(assessment_data.get("interests"))).strip(),
+        str(assessment_data.get("education") or "").strip(),
+        str(assessment_data.get("work_style") or "").strip(),
+    )
+
+
+def _copy_results(results: List[Dict]) -> List[Dict]:
+    # Cached lists must not be shared with callers that may mutate them
+    return [
+        dict(result, matching_skills=list(result["matching_skills"]), missing_skills=list(result["missing_skills"]))
+        for result in results
+    ]
+
+
+def _encode_features(artifacts: ArtifactSet, assessments: Sequence[Dict]) -> np.ndarray:
+    """Build the (n_rows, n_features) matrix in the column order used during training.
+
+    training_assests.py used: ["education_encoded", "work_style_encoded", "interest_encoded"] + all_skills
+    """
+    skills_list = artifacts.skills_list
+    skill_columns = {skill: 3 + i for i, skill in enumerate(skills_list)}
+
+    X = np.zeros((len(assessments), 3 + len(skills_list)), dtype=float)
+    for row, assessment_data in enumerate(assessments):
+        X[row, :3] = _encode_categoricals(artifacts, assessment_data)
+        columns = [skill_columns[s] for s in set(assessment_data.get("skills") or []) if s in skill_columns]
+        X[row, columns] = 1.0
+    return X
+
+
+def _leaf_signatures(artifacts: ArtifactSet, X: np.ndarray, top_k: int) -> List[Tuple]:
+    """Key each row on the feature values the tree can actually see."""
+    projected = np.ascontiguousarray(X[:, artifacts.tree.used_features], dtype=np.float32)
+    return [(artifacts.fingerprint, top_k, row.tobytes()) for row in projected]
+
+
+def _rank_classes(artifacts: ArtifactSet, X: np.ndarray, top_k: int):
+    """Return (classes, scores) per row, best first.
+
+    Rows whose leaf signature is cached skip the tree; the rest are
+    evaluated together in one call.
+    """
+    tree = artifacts.tree
+
+    signatures = _leaf_signatures(artifacts, X, top_k)
+    ranked = [leaf_cache.get(signature) for signature in signatures]
+    pending = [row for row, cached in enumerate(ranked) if cached is MISSING]
+
+    if pending:
+        proba = tree.predict_proba(X[pending])
+        # proba columns align with tree.classes, the encoded career labels
+        indices = np.argsort(proba, axis=1)[:, ::-1][:, :top_k]
+        scores = np.take_along_axis(proba, indices, axis=1)
+        classes = artifacts.career_labels[tree.classes[indices]]
+        for i, row in enumerate(pending):
+            ranked[row] = (classes[i], scores[i])
+            leaf_cache.set(signatures[row], ranked[row])
+
+    return [classes for classes, _ in ranked], [scores for _, scores in ranked]
+
+
+def _build_results(assessment_data: Dict, classes, scores) -> List[Dict]:
+    # One mask per user; each career's gap is then a few bitwise ops
+    user_mask = skill_gap_index.user_mask(assessment_data.get("skills") or [])
 
     results = []
     for rank, (cls, score) in enumerate(zip(classes, scores), start=1):
-        matching_skills = [s for s in skills_list if s in user_skills]
-        missing_skills = [s for s in skills_list if s not in user_skills]
-        completeness = 0.0
-        try:
-            completeness = round((len(matching_skills) / max(1, len(skills_list))) * 100, 2)
-        except Exception:
-            completeness = 0.0
+        career_name = str(cls)
+        matching_skills, missing_skills, completeness = skill_gap_index.analyse(career_name, user_mask)
 
         results.append({
-            "career_name": str(cls),
+            "career_name": career_name,
             "match_score": float(round(float(score) * 100, 2)),
             "confidence_level": _confidence_label(float(score)),
             "rank": rank,
@@ -132,3 +154,55 @@ def predict_careers(assessment_data: Dict, top_k: int = 5) -> List[Dict]:
         })
 
     return results
+
+
+def predict_careers(assessment_data: Dict, top_k: int = 5) -> List[Dict]:
+    """Produce career predictions using the process-wide model registry.
+
+    Artifacts are loaded once per process by ml_model.registry and hot
+    reloaded when they change. The decision tree is evaluated by
+    ml_model.tree.CompiledTree, so sklearn is never called at predict time.
+    Artifacts come from the memory-mapped bundle named by
+    ml_model/artifacts/CURRENT (see ml_model.bundle), or from the legacy
+    pickles in this folder when no bundle exists.
+
+    assessment_data should be a dict with keys used elsewhere in the project,
+    for example: { 'skills': [...], 'interests': [...], 'education': '...', 'work_style': '...' }
+
+    Returns a list of dicts with the keys the code expects in services.create_assessment_with_recommendations
+    (career_name, match_score, confidence_level, rank, matching_skills, missing_skills, completeness_percent).
+    The skill fields compare the user's skills with each career's
+    required_skills from career_data.CAREER_REQUIREMENTS.
+    """
+    return predict_careers_batch([assessment_data], top_k=top_k)[0]
+
+
+def predict_careers_batch(assessments: Sequence[Dict], top_k: int = 5) -> List[List[Dict]]:
+    """Score many assessments with a single model call.
+
+    Rows already in the prediction cache are answered from it; the rest are
+    encoded into one feature matrix, the model is evaluated once and the
+    top-k careers are selected per row with vectorized NumPy ops.
+    Returns one result list per assessment, each identical to what
+    predict_careers would return for that assessment on its own.
+    """
+    if not assessments:
+        return []
+
+    # Take one snapshot so a concurrent hot reload cannot mix artifact versions
+    artifacts = get_artifacts()
+
+    keys = [canonical_key(artifacts, assessment_data, top_k) for assessment_data in assessments]
+    output: List = [prediction_cache.get(key) for key in keys]
+    pending = [row for row, cached in enumerate(output) if cached is MISSING]
+
+    if pending:
+        rows = [assessments[row] for row in pending]
+        X = _encode_features(artifacts, rows)
+        classes, scores = _rank_classes(artifacts, X, top_k)
+        for i, row in enumerate(pending):
+            results = _build_results(rows[i], classes[i], scores[i])
+            prediction_cache.set(keys[row], results)
+            output[row] = results
+
+    return [_copy_results(results) for results in output]
@@ -0,0 +1,332 @@
+import hashlib
+import io
+import logging
+import os
+import pickle
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .bundle import MANIFEST, current_build_id, load_bundle
+from .tree import CompiledTree
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Memory-mapped bundles (see ml_model.bundle) live under ARTIFACT_DIR/artifacts
+# and take precedence over the legacy pickles below.
+BUNDLE_ROOT = "artifacts"
+
+# Legacy files written by older versions of training_assests.py. The interest
+# files are optional, and the model may come from either the compiled tree or
+# the sklearn pickle.
+REQUIRED_FILES = (
+    "label_encoder.pkl",
+    "education_encoder.pkl",
+    "work_style_encoder.pkl",
+    "skills_list.pkl",
+)
+OPTIONAL_FILES = (
+    "compiled_tree.npz",
+    "trained_model.pkl",
+    "interest_encoder.pkl",
+    "interests_list.pkl",
+)
+
+
+def build_lookup(labels: Optional[Sequence[str]]) -> Dict[str, int]:
+    """Map each encoder class to its integer code (LabelEncoder order)."""
+    if labels is None:
+        return {}
+    return {str(label).strip(): code for code, label in enumerate(labels)}
+
+
+class ArtifactSet:
+    """Immutable snapshot of every artifact predict_careers needs.
+
+    A new ArtifactSet is built completely before it is published by the
+    registry, so a request holding a reference never sees a mix of old and
+    new files. The LabelEncoders are reduced to plain dict lookup tables
+    here, once per load, so encoding a request never calls into sklearn.
+    """
+
+    def __init__(self, tree: CompiledTree, model, career_labels: Sequence[str],
+                 education_classes: Sequence[str], work_style_classes: Sequence[str],
+                 interest_classes: Optional[Sequence[str]],
+                 skills_list: List[str], interests_list: Optional[List[str]],
+                 fingerprint: str, version: int, load_seconds: float,
+                 manifest: Optional[Dict] = None):
+        self.tree = tree
+        # The sklearn model is only kept when there was no compiled tree on disk
+        self.model = model
+        self.career_labels = np.asarray([str(label) for label in career_labels], dtype=object)
+        self.career_index = build_lookup(career_labels)
+        self.education_index = build_lookup(education_classes)
+        self.work_style_index = build_lookup(work_style_classes)
+        # Older artifact sets have no interest encoder; every interest encodes to 0
+        self.interest_index = build_lookup(interest_classes)
+        self.skills_list = skills_list
+        self.interests_list = interests_list
+        self.fingerprint = fingerprint
+        # Bundle manifest; None for legacy pickle artifacts
+        self.manifest = manifest
+        self.build_id = manifest["build_id"] if manifest else None
+        # Hash of the training inputs; None for converted or legacy artifacts
+        self.build_hash = manifest.get("build_hash") if manifest else None
+        self.version = version
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+
+    def __repr__(self):
+        return f"<ArtifactSet v{self.version} {self.fingerprint[:12]}>"
+
+
+class ModelRegistry:
+    """Process-wide, thread-safe holder of the current ArtifactSet.
+
+    Artifacts are loaded on first use and kept in memory. At most every
+    ``check_interval`` seconds the registry checks the bundle's CURRENT
+    pointer (or the legacy files' mtime/size); when it changes it loads a
+    fresh set and swaps it in with a single reference assignment. If the
+    reload fails the previous set keeps serving.
+    """
+
+    def __init__(self, artifact_dir: str = ARTIFACT_DIR, check_interval: float = 2.0):
+        self.artifact_dir = artifact_dir
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._current: Optional[ArtifactSet] = None
+        self._signature: Optional[Tuple] = None
+        self._last_check = 0.0
+        self._version = 0
+        self._listeners: List[Callable[[ArtifactSet], None]] = []
+        # Set by use_shared_memory(); see ml_model.shared
+        self.shared_memory_name: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self) -> ArtifactSet:
+        """Return the current artifacts, loading or hot-reloading if needed."""
+        current = self._current
+        if current is not None and time.monotonic() - self._last_check < self.check_interval:
+            return current
+
+        with self._lock:
+            current = self._current
+            if current is not None and time.monotonic() - self._last_check < self.check_interval:
+                return current
+
+            try:
+                signature = self._stat_signature()
+                if current is None or signature != self._signature:
+                    self._swap_in(signature)
+            except Exception:
+                if current is None:
+                    raise
+                logger.exception("Model reload failed; keeping %r", current)
+            self._last_check = time.monotonic()
+            return self._current
+
+    def reload(self) -> ArtifactSet:
+        """Force a reload from disk regardless of the file signature."""
+        with self._lock:
+            self._swap_in(self._stat_signature())
+            self._last_check = time.monotonic()
+            return self._current
+
+    def use_shared_memory(self, name: str) -> ArtifactSet:
+        """Serve from a segment published by ml_model.shared instead of disk."""
+        with self._lock:
+            self.shared_memory_name = name
+            self._swap_in(self._stat_signature())
+            self._last_check = time.monotonic()
+            return self._current
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        current = self._current
+        return current.fingerprint if current is not None else None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def is_loaded(self) -> bool:
+        return self._current is not None
+
+    def peek(self) -> Optional[ArtifactSet]:
+        """The loaded artifacts, without checking the files or loading anything."""
+        return self._current
+
+    def add_reload_listener(self, callback: Callable[[ArtifactSet], None]) -> None:
+        """Register ``callback(artifacts)`` to run after every successful swap."""
+        self._listeners.append(callback)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.artifact_dir, filename)
+
+    @property
+    def bundle_root(self) -> str:
+        return os.path.join(self.artifact_dir, BUNDLE_ROOT)
+
+    def _stat_signature(self) -> Tuple:
+        if self.shared_memory_name:
+            # A published segment never changes; new models arrive with a new worker
+            return ("shared", self.shared_memory_name)
+        build_id = current_build_id(self.bundle_root)
+        if build_id is not None:
+            manifest_path = os.path.join(self.bundle_root, build_id, MANIFEST)
+            st = os.stat(manifest_path)
+            return ("bundle", build_id, st.st_mtime_ns, st.st_size)
+        return self._stat_pickles()
+
+    def _stat_pickles(self) -> Tuple:
+        entries = []
+        for filename in REQUIRED_FILES + OPTIONAL_FILES:
+            try:
+                st = os.stat(self._path(filename))
+            except FileNotFoundError:
+                if filename in REQUIRED_FILES:
+                    raise FileNotFoundError(
+                        f"Required model file not found: {self._path(filename)}"
+                    )
+                entries.append((filename, None, None))
+                continue
+            entries.append((filename, st.st_mtime_ns, st.st_size))
+        if all(entry[1] is None for entry in entries if entry[0] in ("compiled_tree.npz", "trained_model.pkl")):
+            raise FileNotFoundError(
+                f"Required model file not found: {self._path('compiled_tree.npz')} "
+                f"or {self._path('trained_model.pkl')}"
+            )
+        return ("pickles",) + tuple(entries)
+
+    def _swap_in(self, signature: Tuple) -> None:
+        started = time.perf_counter()
+        if signature[0] == "shared":
+            fields = self._load_shared(signature[1])
+        elif signature[0] == "bundle":
+            fields = self._load_bundle(signature[1])
+        else:
+            fields, consistent = self._load_pickles(signature)
+            if not consistent:
+                signature = None
+
+        artifacts = ArtifactSet(
+            version=self._version + 1,
+            load_seconds=time.perf_counter() - started,
+            **fields
+        )
+
+        self._version = artifacts.version
+        self._signature = signature
+        self._current = artifacts
+        logger.info("Loaded model artifacts %r in %.3fs", artifacts, artifacts.load_seconds)
+
+        for callback in list(self._listeners):
+            try:
+                callback(artifacts)
+            except Exception:
+                logger.exception("Model reload listener %r failed", callback)
+
+    def _load_bundle(self, build_id: str) -> Dict:
+        bundle_dir = os.path.join(self.bundle_root, build_id)
+        manifest, arrays = load_bundle(bundle_dir)
+        with open(os.path.join(bundle_dir, MANIFEST), "rb") as f:
+            fingerprint = hashlib.sha256(f.read()).hexdigest()
+        return self._fields_from_arrays(manifest, arrays, fingerprint)
+
+    def _load_shared(self, name: str) -> Dict:
+        from .shared import attach
+
+        manifest, arrays, fingerprint = attach(name)
+        return self._fields_from_arrays(manifest, arrays, fingerprint)
+
+    @staticmethod
+    def _fields_from_arrays(manifest: Dict, arrays: Dict, fingerprint: str) -> Dict:
+        def _strings(name):
+            return [str(v) for v in arrays[name]] if name in arrays else None
+
+        return {
+            "tree": CompiledTree.from_arrays(arrays),
+            "model": None,
+            "career_labels": _strings("career_labels"),
+            "education_classes": _strings("education_classes"),
+            "work_style_classes": _strings("work_style_classes"),
+            "interest_classes": _strings("interest_classes"),
+            "skills_list": _strings("skills_list"),
+            "interests_list": _strings("interests_list"),
+            "fingerprint": fingerprint,
+            "manifest": manifest,
+        }
+
+    def _load_pickles(self, signature: Tuple) -> Tuple[Dict, bool]:
+        """Legacy loader for the pickles written before the bundle format.
+
+        Returns the ArtifactSet fields and whether the files stayed unchanged
+        while they were read.
+        """
+        logger.warning(
+            "Loading legacy pickle artifacts from %s; run 'manage.py convert_model_artifacts' "
+            "to switch to the memory-mapped bundle", self.artifact_dir
+        )
+        raw: Dict[str, bytes] = {}
+        for filename in REQUIRED_FILES + OPTIONAL_FILES:
+            path = self._path(filename)
+            if filename in OPTIONAL_FILES and not os.path.exists(path):
+                continue
+            if filename == "trained_model.pkl" and "compiled_tree.npz" in raw:
+                # The compiled tree is all serving needs; skip unpickling sklearn
+                continue
+            with open(path, "rb") as f:
+                raw[filename] = f.read()
+
+        # A writer may still be replacing files; only trust the signature if
+        # nothing changed while we were reading.
+        consistent = self._stat_pickles() == signature[1:] if signature[0] == "pickles" else False
+
+        digest = hashlib.sha256()
+        for filename in sorted(raw):
+            digest.update(filename.encode())
+            digest.update(hashlib.sha256(raw[filename]).digest())
+
+        model = None
+        if "compiled_tree.npz" in raw:
+            with np.load(io.BytesIO(raw["compiled_tree.npz"]), allow_pickle=False) as arrays:
+                tree = CompiledTree.from_arrays(arrays)
+        else:
+            model = pickle.loads(raw["trained_model.pkl"])
+            tree = CompiledTree.from_model(model)
+
+        interest_encoder_raw = raw.get("interest_encoder.pkl")
+        interests_raw = raw.get("interests_list.pkl")
+        fields = {
+            "tree": tree,
+            "model": model,
+            "career_labels": list(pickle.loads(raw["label_encoder.pkl"]).classes_),
+            "education_classes": list(pickle.loads(raw["education_encoder.pkl"]).classes_),
+            "work_style_classes": list(pickle.loads(raw["work_style_encoder.pkl"]).classes_),
+            "interest_classes": (
+                list(pickle.loads(interest_encoder_raw).classes_)
+                if interest_encoder_raw is not None else None
+            ),
+            "skills_list": list(pickle.loads(raw["skills_list.pkl"])),
+            "interests_list": pickle.loads(interests_raw) if interests_raw is not None else None,
+            "fingerprint": digest.hexdigest(),
+            "manifest": None,
+        }
+        return fields, consistent
+
+
+registry = ModelRegistry()
+
+
+def get_artifacts() -> ArtifactSet:
+    """Return the process-wide ArtifactSet."""
+    return registry.get()
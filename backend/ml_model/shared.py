@@ -0,0 +1,166 @@
+"""Serve one copy of the model to many worker processes via shared memory.
+
+A parent process (e.g. the gunicorn master with ``--preload``) copies the
+current artifact bundle into a single ``multiprocessing.shared_memory``
+segment with :func:`publish_current`. Workers attach read-only by name;
+every worker's arrays are views on the same physical pages, so adding
+workers does not add model copies.
+
+Segment layout: an 8-byte little-endian header length, a JSON header
+(bundle manifest, fingerprint, and offset/dtype/shape per array), then the
+array bytes, each aligned to 64 bytes.
+"""
+import atexit
+import hashlib
+import json
+import os
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .bundle import BundleError, MANIFEST, current_build_id, load_bundle
+
+# Workers find the segment through this variable; set it before forking
+SHM_NAME_ENV = "CAREER_MODEL_SHM_NAME"
+# Set to "1" in the parent process to publish the model on startup
+SHM_PUBLISH_ENV = "CAREER_MODEL_SHM_PUBLISH"
+
+ALIGNMENT = 64
+_HEADER_LENGTH = struct.Struct("<Q")
+
+# Attached segments must outlive every array view handed out from them
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class SharedModel:
+    """Handle on a segment published by this process."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, fingerprint: str):
+        self.shm = shm
+        self.name = shm.name
+        self.size = shm.size
+        self.fingerprint = fingerprint
+        self._owner_pid = os.getpid()
+
+    def unlink(self) -> None:
+        # Forked workers inherit atexit hooks; only the publisher may unlink
+        if os.getpid() != self._owner_pid or self.shm is None:
+            return
+        shm, self.shm = self.shm, None
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def publish_arrays(manifest: Dict, arrays: Dict[str, np.ndarray], fingerprint: str,
+                   name: Optional[str] = None) -> SharedModel:
+    """Copy ``arrays`` into a new shared memory segment."""
+    layout = {}
+    offset = 0
+    for array_name, array in arrays.items():
+        offset = _align(offset)
+        layout[array_name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset += array.nbytes
+
+    header = json.dumps({"manifest": manifest, "fingerprint": fingerprint, "arrays": layout}).encode()
+    data_start = _align(_HEADER_LENGTH.size + len(header))
+
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(1, data_start + offset))
+    try:
+        _HEADER_LENGTH.pack_into(shm.buf, 0, len(header))
+        shm.buf[_HEADER_LENGTH.size:_HEADER_LENGTH.size + len(header)] = header
+        for array_name, array in arrays.items():
+            entry = layout[array_name]
+            target = np.ndarray(entry["shape"], dtype=array.dtype, buffer=shm.buf,
+                                offset=data_start + entry["offset"])
+            target[...] = array
+            del target
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+
+    handle = SharedModel(shm, fingerprint)
+    atexit.register(handle.unlink)
+    return handle
+
+
+def publish_current(artifact_dir: Optional[str] = None, name: Optional[str] = None) -> SharedModel:
+    """Publish the bundle CURRENT points at and export its name for workers."""
+    from .registry import ARTIFACT_DIR, BUNDLE_ROOT
+
+    root = os.path.join(artifact_dir or ARTIFACT_DIR, BUNDLE_ROOT)
+    build_id = current_build_id(root)
+    if build_id is None:
+        raise BundleError(f"No artifact bundle is active under {root}")
+
+    bundle_dir = os.path.join(root, build_id)
+    manifest, arrays = load_bundle(bundle_dir)
+    with open(os.path.join(bundle_dir, MANIFEST), "rb") as f:
+        fingerprint = hashlib.sha256(f.read()).hexdigest()
+
+    handle = publish_arrays(manifest, arrays, fingerprint, name=name)
+    os.environ[SHM_NAME_ENV] = handle.name
+    return handle
+
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    try:
+        # Python 3.13+: attaching must not hand the segment to our resource tracker
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Older Pythons always register the segment. A tracker this process
+    # started itself would unlink the publisher's segment when we exit, so
+    # drop the registration; an inherited (shared) tracker is left alone.
+    own_tracker = getattr(resource_tracker._resource_tracker, "_fd", None) is None
+    shm = shared_memory.SharedMemory(name=name)
+    if own_tracker:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def attach(name: str) -> Tuple[Dict, Dict[str, np.ndarray], str]:
+    """Return ``(manifest, arrays, fingerprint)`` as read-only views on segment ``name``."""
+    shm = _attached.get(name)
+    if shm is None:
+        shm = _open_segment(name)
+        _attached[name] = shm
+
+    (header_length,) = _HEADER_LENGTH.unpack_from(shm.buf, 0)
+    header = json.loads(bytes(shm.buf[_HEADER_LENGTH.size:_HEADER_LENGTH.size + header_length]))
+    data_start = _align(_HEADER_LENGTH.size + header_length)
+
+    arrays = {}
+    for array_name, entry in header["arrays"].items():
+        array = np.ndarray(entry["shape"], dtype=np.dtype(entry["dtype"]), buffer=shm.buf,
+                           offset=data_start + entry["offset"])
+        array.flags.writeable = False
+        arrays[array_name] = array
+    return header["manifest"], arrays, header["fingerprint"]
+
+
+def setup_from_environment() -> Optional[str]:
+    """Hook for WSGI/ASGI entry points.
+
+    With CAREER_MODEL_SHM_PUBLISH=1 the current process publishes the model
+    (run it in the parent, before workers fork). When CAREER_MODEL_SHM_NAME
+    is set, the process-wide registry serves from that segment. Returns the
+    segment name in use, if any.
+    """
+    from .registry import registry
+
+    name = os.environ.get(SHM_NAME_ENV)
+    if not name and os.environ.get(SHM_PUBLISH_ENV) == "1":
+        name = publish_current().name
+    if name:
+        registry.use_shared_memory(name)
+    return name
@@ -0,0 +1,76 @@
+"""Per-career skill gap analysis on integer bitmasks.
+
+Every skill named in CAREER_REQUIREMENTS gets a bit in a shared vocabulary
+and every career is reduced to one integer mask of its required skills.
+Matching, missing and completeness for any career then take a couple of
+bitwise operations on Python ints, independent of catalog size.
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .career_data import CAREER_REQUIREMENTS
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+class SkillGapIndex:
+    """Skill vocabulary plus one required-skills bitmask per career."""
+
+    def __init__(self, career_skills: Dict[str, Sequence[str]]):
+        self.vocabulary: Dict[str, int] = {}
+        self.skills: List[str] = []
+        self.career_masks: Dict[str, int] = {}
+        self.career_counts: Dict[str, int] = {}
+
+        for career, required in career_skills.items():
+            mask = 0
+            for skill in required:
+                bit = self.vocabulary.get(skill)
+                if bit is None:
+                    bit = len(self.skills)
+                    self.vocabulary[skill] = bit
+                    self.skills.append(skill)
+                mask |= 1 << bit
+            self.career_masks[career] = mask
+            self.career_counts[career] = _popcount(mask)
+
+    @classmethod
+    def from_requirements(cls, requirements: Dict[str, Dict]) -> "SkillGapIndex":
+        return cls({career: details.get("required_skills", []) for career, details in requirements.items()})
+
+    def user_mask(self, skills: Iterable[str]) -> int:
+        """Bitmask of the user's skills; skills no career requires are ignored."""
+        mask = 0
+        vocabulary = self.vocabulary
+        for skill in skills:
+            bit = vocabulary.get(skill)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        """Decode a mask into skill names in vocabulary order."""
+        names = []
+        skills = self.skills
+        while mask:
+            lowest = mask & -mask
+            names.append(skills[lowest.bit_length() - 1])
+            mask ^= lowest
+        return names
+
+    def analyse(self, career: str, user_mask: int) -> Tuple[List[str], List[str], float]:
+        """Return (matching_skills, missing_skills, completeness_percent) for one career.
+
+        Careers without requirements have nothing to match and report 0% completeness.
+        """
+        required = self.career_masks.get(career, 0)
+        if not required:
+            return [], [], 0.0
+        matching = required & user_mask
+        missing = required & ~user_mask
+        completeness = round(_popcount(matching) / self.career_counts[career] * 100, 2)
+        return self.names(matching), self.names(missing), completeness
+
+
+skill_gap_index = SkillGapIndex.from_requirements(CAREER_REQUIREMENTS)
@@ -1,3 +1,517 @@
-from django.test import TestCase
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from sklearn.tree import DecisionTreeClassifier
+
+from .batching import MicroBatcher
+from .bundle import build_arrays, load_bundle, write_bundle
+from .cache import MISSING, LRUCache
+from .dataset import iter_chunks, read_chunks, write_dataset
+from .features import build_feature_matrix, encode_skills
+from .online import checkpoint_path, load_checkpoint, update_from_assessments
+from .training import generate_and_train, predict_in_chunks, select
+from .predict import predict_careers_batch
+from .registry import ModelRegistry
+from .shared import attach, publish_current
+from .skill_gap import SkillGapIndex
+from .tree import CompiledTree, export_tree, load_tree, save_tree
+
+
+SKILLS = ["Programming", "Git", "SQL", "Statistics", "Graphic Design", "Typography"]
+CAREERS = ["Data Analyst", "Graphic Designer", "Software Developer"]
+
+
+def make_bundle_arrays(seed=0):
+    """Train a tiny tree on the serving feature layout and return bundle arrays."""
+    rng = np.random.RandomState(seed)
+    X = np.hstack([rng.randint(0, 3, size=(300, 3)), rng.randint(0, 2, size=(300, len(SKILLS)))]).astype(float)
+    y = rng.randint(0, len(CAREERS), size=300)
+    model = DecisionTreeClassifier(max_depth=6, random_state=seed).fit(X, y)
+    return build_arrays(
+        export_tree(model),
+        career_labels=CAREERS,
+        education_classes=["Associate Degree", "Bachelor's Degree", "Master's Degree"],
+        work_style_classes=["Hybrid", "Office", "Remote"],
+        interest_classes=["Analytics", "Arts & Design", "Technology & Innovation"],
+        skills_list=SKILLS,
+        interests_list=["Analytics", "Arts & Design", "Technology & Innovation"],
+    )
+
+
+class CompiledTreeParityTests(SimpleTestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        # Same layout as training: three encoded categoricals followed by 0/1 skill columns
+        categoricals = rng.randint(0, 8, size=(600, 3))
+        skills = rng.randint(0, 2, size=(600, 37))
+        self.X = np.hstack([categoricals, skills]).astype(float)
+        self.y = rng.randint(0, 10, size=600)
+        self.model = DecisionTreeClassifier(max_depth=8, random_state=42).fit(self.X, self.y)
+        self.tree = CompiledTree.from_model(self.model)
+
+    def test_batch_probabilities_match_sklearn(self):
+        np.testing.assert_allclose(self.tree.predict_proba(self.X), self.model.predict_proba(self.X))
+
+    def test_single_row_probabilities_match_sklearn(self):
+        for row in self.X[:25]:
+            np.testing.assert_allclose(
+                self.tree.predict_proba(row),
+                self.model.predict_proba(row.reshape(1, -1)),
+            )
+
+    def test_leaves_and_predictions_match_sklearn(self):
+        np.testing.assert_array_equal(self.tree.apply(self.X), self.model.apply(self.X))
+        np.testing.assert_array_equal(self.tree.predict(self.X), self.model.predict(self.X))
+
+    def test_unseen_rows_match_sklearn(self):
+        X = np.random.RandomState(1).randint(0, 3, size=(200, self.X.shape[1])).astype(float)
+        np.testing.assert_allclose(self.tree.predict_proba(X), self.model.predict_proba(X))
+
+    def test_saved_tree_round_trips(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "compiled_tree.npz")
+            save_tree(path, self.tree)
+            loaded = load_tree(path)
+        np.testing.assert_allclose(loaded.predict_proba(self.X), self.model.predict_proba(self.X))
+
+
+class SkillEncodingTests(SimpleTestCase):
+    vocabulary = ["Java", "JavaScript", "Programming", "SQL"]
+
+    def test_matches_whole_skills_only(self):
+        matrix = encode_skills(["JavaScript, SQL", "Java", "Programming Languages"], self.vocabulary)
+
+        self.assertEqual(matrix.format, "csr")
+        np.testing.assert_array_equal(matrix.toarray(), [[0, 1, 0, 1], [1, 0, 0, 0], [0, 0, 0, 0]])
+
+    def test_accepts_lists_duplicates_and_missing_rows(self):
+        matrix = encode_skills([["SQL", "SQL", "Unknown"], None, [], "Java, Java"], self.vocabulary)
+
+        np.testing.assert_array_equal(matrix.toarray(), [[0, 0, 0, 1], [0, 0, 0, 0], [0, 0, 0, 0], [1, 0, 0, 0]])
+
+    def test_feature_matrix_puts_categoricals_first(self):
+        X = build_feature_matrix(np.array([[2, 0, 1]]), encode_skills(["SQL"], self.vocabulary))
+
+        np.testing.assert_array_equal(X.toarray(), [[2, 0, 1, 0, 0, 0, 1]])
+
+
+class DatasetGeneratorTests(SimpleTestCase):
+    requirements = {
+        "Alpha": {"required_skills": SKILLS[:6], "interests": ["I1"], "education": ["E1"], "work_style": ["W1", "W2"]},
+        "Beta": {"required_skills": SKILLS[2:5], "interests": ["I2", "I3"], "education": ["E2"], "work_style": ["W1"]},
+    }
+
+    def test_output_does_not_depend_on_workers(self):
+        serial = list(iter_chunks(self.requirements, rows_per_career=50, seed=3, chunk_size=30))
+        parallel = list(iter_chunks(self.requirements, rows_per_career=50, seed=3, chunk_size=30, workers=2))
+
+        self.assertEqual([len(chunk) for chunk in serial], [30, 30, 30, 10])
+        for left, right in zip(serial, parallel):
+            self.assertTrue(left.equals(right))
+
+    def test_written_dataset_round_trips_in_chunks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "training_data.csv")
+            rows = write_dataset(path, self.requirements, rows_per_career=40, seed=1, chunk_size=25)
+            frame = pd.concat(read_chunks(path, chunk_size=25), ignore_index=True)
+
+        self.assertEqual(rows, 80)
+        self.assertEqual(frame["career"].value_counts().to_dict(), {"Alpha": 40, "Beta": 40})
+        beta_skills = {s for skills in frame.loc[frame["career"] == "Beta", "skills"] for s in skills.split(", ")}
+        self.assertLessEqual(beta_skills, set(SKILLS[2:5]))
+
+
+class TrainingSearchTests(SimpleTestCase):
+
+    def test_select_prefers_accuracy_within_budget(self):
+        results = [
+            {"params": {"max_depth": None}, "accuracy": 0.95, "latency_ms_per_row": 2.0, "n_nodes": 90},
+            {"params": {"max_depth": 8}, "accuracy": 0.90, "latency_ms_per_row": 0.5, "n_nodes": 40},
+            {"params": {"max_depth": 12}, "accuracy": 0.90, "latency_ms_per_row": 0.4, "n_nodes": 60},
+        ]
+
+        self.assertEqual(select(results, latency_budget_ms=1.0)["params"], {"max_depth": 8})
+        self.assertEqual(select(results, latency_budget_ms=5.0)["params"], {"max_depth": None})
+        self.assertIsNone(select(results, latency_budget_ms=0.1))
+
+    def test_sparse_holdout_is_scored_in_chunks(self):
+        from scipy import sparse
+
+        rng = np.random.RandomState(0)
+        X = rng.randint(0, 2, size=(50, 8)).astype(float)
+        tree = CompiledTree.from_model(DecisionTreeClassifier(random_state=0).fit(X, rng.randint(0, 3, size=50)))
+
+        np.testing.assert_array_equal(predict_in_chunks(tree, sparse.csr_matrix(X), chunk_rows=7), tree.predict(X))
+
+    def test_trained_bundle_serves_selected_model(self):
+        candidates = [{"max_depth": 4}, {"max_depth": 12}]
+        with tempfile.TemporaryDirectory() as directory:
+            outcome = generate_and_train(
+                os.path.join(directory, "training_data.csv"), os.path.join(directory, "artifacts"),
+                rows_per_career=20, candidates=candidates, latency_budget_ms=1000, n_jobs=1,
+            )
+            artifacts = ModelRegistry(directory).get()
+
+        self.assertEqual(len(outcome["results"]), 2)
+        self.assertIn(outcome["selected"]["params"], candidates)
+        self.assertEqual(artifacts.build_id, outcome["build_id"])
+        self.assertEqual(artifacts.manifest["metadata"]["selected"]["params"], outcome["selected"]["params"])
+
+    def test_unchanged_inputs_reuse_the_build(self):
+        options = {"rows_per_career": 10, "candidates": [{"max_depth": 4}], "latency_budget_ms": 1000, "n_jobs": 1}
+        with tempfile.TemporaryDirectory() as directory:
+            data_path = os.path.join(directory, "training_data.csv")
+            root = os.path.join(directory, "artifacts")
+            first = generate_and_train(data_path, root, **options)
+            os.remove(data_path)
+            second = generate_and_train(data_path, root, **options)
+            reseeded = generate_and_train(data_path, root, seed=7, **options)
+            manifest = load_bundle(os.path.join(root, first["build_id"]))[0]
+
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["build_id"], first["build_id"])
+        self.assertEqual(manifest["build_hash"], first["build_hash"])
+        self.assertFalse(reseeded["cached"])
+        self.assertNotEqual(reseeded["build_hash"], first["build_hash"])
+
+
+class SkillGapIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        self.index = SkillGapIndex({
+            "Software Developer": ["Programming", "Git", "Debugging"],
+            "Data Analyst": ["SQL", "Excel", "Programming", "Statistics"],
+        })
+
+    def test_gap_is_computed_per_career(self):
+        user_mask = self.index.user_mask(["Programming", "SQL", "Photography"])
+
+        self.assertEqual(
+            self.index.analyse("Software Developer", user_mask),
+            (["Programming"], ["Git", "Debugging"], 33.33),
+        )
+        self.assertEqual(
+            self.index.analyse("Data Analyst", user_mask),
+            (["Programming", "SQL"], ["Excel", "Statistics"], 50.0),
+        )
+
+    def test_unknown_career_has_no_gap(self):
+        self.assertEqual(self.index.analyse("Astronaut", self.index.user_mask(["SQL"])), ([], [], 0.0))
+
+
+class LRUCacheTests(SimpleTestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2, ttl=None)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIs(cache.get("b"), MISSING)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_entries_expire_after_ttl(self):
+        now = [0.0]
+        cache = LRUCache(maxsize=10, ttl=5.0, clock=lambda: now[0])
+        cache.set("a", 1)
+        now[0] = 4.9
+        self.assertEqual(cache.get("a"), 1)
+        now[0] = 5.0
+        self.assertIs(cache.get("a"), MISSING)
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (1, 1, 1))
+
+
+class ArtifactBundleTests(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.artifact_dir = tmp.name
+        self.bundle_root = os.path.join(tmp.name, "artifacts")
+
+    def test_bundle_is_memory_mapped(self):
+        build_id = write_bundle(self.bundle_root, make_bundle_arrays())
+        manifest, arrays = load_bundle(os.path.join(self.bundle_root, build_id))
+
+        self.assertEqual(manifest["build_id"], build_id)
+        self.assertIsInstance(arrays["threshold"], np.memmap)
+        self.assertEqual(list(arrays["career_labels"]), CAREERS)
+
+    def test_registry_hot_swaps_to_new_bundle(self):
+        registry = ModelRegistry(self.artifact_dir, check_interval=0)
+        first_id = write_bundle(self.bundle_root, make_bundle_arrays(seed=0))
+        first = registry.get()
+        second_id = write_bundle(self.bundle_root, make_bundle_arrays(seed=1))
+        second = registry.get()
+
+        self.assertEqual((first.build_id, second.build_id), (first_id, second_id))
+        self.assertNotEqual(first.fingerprint, second.fingerprint)
+        self.assertEqual(second.version, first.version + 1)
+        self.assertIs(registry.get(), second)
+
+
+SAMPLE_ASSESSMENTS = [
+    {"skills": ["Programming", "Git", "SQL"], "interests": ["Technology & Innovation"],
+     "education": "Bachelor's Degree", "work_style": "Remote"},
+    {"skills": ["Graphic Design", "Typography"], "interests": ["Arts & Design", "Analytics"],
+     "education": "Associate Degree", "work_style": "Hybrid"},
+    {"skills": ["SQL", "Statistics"], "interests": ["Analytics"],
+     "education": "Master's Degree", "work_style": "Office"},
+]
+
+
+def _predict_in_worker(name):
+    from .registry import registry
+
+    artifacts = registry.use_shared_memory(name)
+    return os.getpid(), artifacts.fingerprint, predict_careers_batch(SAMPLE_ASSESSMENTS)
+
+
+class SharedMemoryModelTests(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.artifact_dir = tmp.name
+        write_bundle(os.path.join(tmp.name, "artifacts"), make_bundle_arrays())
+
+        self.handle = publish_current(self.artifact_dir)
+        self.addCleanup(self.handle.unlink)
+        self.addCleanup(os.environ.pop, "CAREER_MODEL_SHM_NAME", None)
+
+    def test_attached_arrays_are_read_only(self):
+        _, arrays, fingerprint = attach(self.handle.name)
+
+        self.assertEqual(fingerprint, self.handle.fingerprint)
+        self.assertFalse(arrays["threshold"].flags.writeable)
+        self.assertEqual(list(arrays["skills_list"]), SKILLS)
+
+    def test_worker_processes_predict_identically(self):
+        with mock.patch("ml_model.registry.registry", ModelRegistry(self.artifact_dir)):
+            expected = predict_careers_batch(SAMPLE_ASSESSMENTS)
+
+        with multiprocessing.get_context("spawn").Pool(3) as pool:
+            outputs = pool.map(_predict_in_worker, [self.handle.name] * 6)
+
+        self.assertGreater(len({pid for pid, _, _ in outputs}), 1)
+        for _, fingerprint, results in outputs:
+            self.assertEqual(fingerprint, self.handle.fingerprint)
+            self.assertEqual(results, expected)
+
+
+class PredictionCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        from . import predict
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.bundle_root = os.path.join(tmp.name, "artifacts")
+        self.predict = predict
+        self.registry = ModelRegistry(tmp.name, check_interval=0)
+        self.registry.add_reload_listener(predict._clear_caches)
+        patcher = mock.patch("ml_model.registry.registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for cache in (predict.prediction_cache, predict.leaf_cache):
+            cache.clear()
+            self.addCleanup(cache.clear)
+
+    def _full_evaluation(self, top_k=5):
+        """Top careers per sample straight from the tree, bypassing both caches."""
+        artifacts = self.registry.get()
+        proba = artifacts.tree.predict_proba(self.predict._encode_features(artifacts, SAMPLE_ASSESSMENTS))
+        indices = np.argsort(proba, axis=1)[:, ::-1][:, :top_k]
+        return [list(careers) for careers in artifacts.career_labels[artifacts.tree.classes[indices]]]
+
+    def _careers(self, results):
+        return [[r["career_name"] for r in result] for result in results]
+
+    def test_leaf_cache_hits_match_full_evaluation(self):
+        write_bundle(self.bundle_root, make_bundle_arrays(seed=0))
+        first = predict_careers_batch(SAMPLE_ASSESSMENTS)
+        # Drop the per-assessment results so every row is answered by the leaf cache
+        self.predict.prediction_cache.clear()
+        hits = self.predict.leaf_cache.stats()["hits"]
+        second = predict_careers_batch(SAMPLE_ASSESSMENTS)
+
+        self.assertEqual(self.predict.leaf_cache.stats()["hits"] - hits, len(SAMPLE_ASSESSMENTS))
+        self.assertEqual(second, first)
+        self.assertEqual(self._careers(second), self._full_evaluation())
+
+    def test_hot_reload_clears_both_caches(self):
+        write_bundle(self.bundle_root, make_bundle_arrays(seed=0))
+        before = predict_careers_batch(SAMPLE_ASSESSMENTS)
+        old_fingerprint = self.registry.get().fingerprint
+        self.assertTrue(len(self.predict.prediction_cache) and len(self.predict.leaf_cache))
+
+        write_bundle(self.bundle_root, make_bundle_arrays(seed=1))
+        self.assertNotEqual(self.registry.get().fingerprint, old_fingerprint)
+        self.assertEqual((len(self.predict.prediction_cache), len(self.predict.leaf_cache)), (0, 0))
+
+        after = predict_careers_batch(SAMPLE_ASSESSMENTS)
+        self.assertEqual(self._careers(after), self._full_evaluation())
+        self.assertNotEqual(self._careers(after), self._careers(before))
+
+
+class MicroBatcherTests(SimpleTestCase):
+
+    def setUp(self):
+        self.batch_sizes = []
+        self.release = threading.Event()
+
+    def _predict_batch(self, assessments, top_k):
+        # Hold the first batch so the remaining requests queue up behind it
+        self.release.wait(5)
+        self.batch_sizes.append(len(assessments))
+        return [[{"id": a["id"], "top_k": top_k}] for a in assessments]
+
+    def test_concurrent_requests_are_batched_and_resolved(self):
+        batcher = MicroBatcher(self._predict_batch, max_batch_size=8, max_wait_ms=50)
+        self.addCleanup(batcher.shutdown, 5)
+
+        futures = [batcher.submit({"id": i}, top_k=3) for i in range(20)]
+        self.release.set()
+
+        self.assertEqual([f.result(5) for f in futures], [[{"id": i, "top_k": 3}] for i in range(20)])
+        self.assertEqual(sum(self.batch_sizes), 20)
+        self.assertLessEqual(max(self.batch_sizes), 8)
+        self.assertLess(len(self.batch_sizes), 20)
+
+        stats = batcher.stats()
+        self.assertEqual(stats["requests"], 20)
+        self.assertEqual(stats["batches"], len(self.batch_sizes))
+
+    def test_failed_batch_fails_every_caller(self):
+        def explode(assessments, top_k):
+            raise RuntimeError("model unavailable")
+
+        batcher = MicroBatcher(explode, max_batch_size=4, max_wait_ms=1)
+        self.addCleanup(batcher.shutdown, 5)
+
+        with self.assertRaisesMessage(RuntimeError, "model unavailable"):
+            batcher.predict({"id": 1}, timeout=5)
+        self.assertEqual(batcher.stats()["failed_batches"], 1)
+
+
+class HealthEndpointTests(SimpleTestCase):
+    def setUp(self):
+        from ml_model import health
+        self.health = health
+        self.addCleanup(health._state.update, dict(health._state))
+        health._state.update(status="cold", error=None, warmup_ms=None, warmed_at=None)
+
+    def test_first_ready_probe_warms_up_and_reports_model(self):
+        with tempfile.TemporaryDirectory() as artifact_dir:
+            build_id = write_bundle(os.path.join(artifact_dir, "artifacts"), make_bundle_arrays())
+            with mock.patch("ml_model.registry.registry", ModelRegistry(artifact_dir)):
+                self.assertFalse(self.client.get("/api/health/live").json()["model_loaded"])
+                response = self.client.get("/api/health/ready")
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["model"]["build_id"], build_id)
+        self.assertGreater(payload["warmup"]["latency_ms"], 0)
+
+    def test_ready_is_503_when_warm_up_fails(self):
+        with tempfile.TemporaryDirectory() as artifact_dir:
+            with mock.patch("ml_model.registry.registry", ModelRegistry(artifact_dir)):
+                response = self.client.get("/api/health/ready/")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "failed")
+        self.assertEqual(self.client.get("/api/health/live/").status_code, 200)
+
+
+class LazyImportTests(SimpleTestCase):
+    def test_services_import_does_not_load_ml_stack(self):
+        script = (
+            "import sys, django; django.setup(); import recommendations.services; "
+            "print(','.join(m for m in ('numpy', 'sklearn', 'ml_model.predict') if m in sys.modules))"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="career_api.settings")
+        output = subprocess.run([sys.executable, "-c", script], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "")
+
+
+class IncrementalUpdateTests(TestCase):
+
+    def setUp(self):
+        from ml_model.career_data import CAREER_REQUIREMENTS
+
+        self.user = get_user_model().objects.create_user("learner@example.com", "learner", "pw")
+        self.careers = list(CAREER_REQUIREMENTS.items())
+        self.artifact_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.artifact_dir, ignore_errors=True)
+
+    def _add_assessments(self, count, career=None):
+        from recommendations.models import Assessment, Recommendation
+
+        for i in range(count):
+            name, details = self.careers[i % len(self.careers)]
+            assessment = Assessment.objects.create(
+                user=self.user, skills=details["required_skills"][:3], interests=details["interests"],
+                education_level=details["education"][0], work_style=details["work_style"][0],
+            )
+            Recommendation.objects.create(
+                assessment=assessment, career_name=career or name, match_score=90, confidence_level="High",
+                rank=1, matching_skills=[], missing_skills=[], completeness_percent=50, rationale={},
+            )
+        return assessment.id
+
+    def test_updates_resume_from_the_checkpoint(self):
+        self._add_assessments(40)
+        self._add_assessments(2, career="Astronaut")
+        first = update_from_assessments(self.artifact_dir, chunk_size=16)
+
+        self.assertEqual((first["rows"], first["skipped"]), (40, 2))
+        self.assertEqual(update_from_assessments(self.artifact_dir)["rows"], 0)
+
+        last_id = self._add_assessments(10)
+        second = update_from_assessments(self.artifact_dir, chunk_size=16)
+        model, state = load_checkpoint(checkpoint_path(self.artifact_dir))
+
+        self.assertEqual(second["rows"], 10)
+        self.assertEqual(state["last_assessment_id"], last_id)
+        self.assertEqual(state["rows_seen"], 50)
+        self.assertGreater(model.steps, 0)
+
+    def test_mock_served_assessments_are_not_learned_from(self):
+        from recommendations.models import Assessment
+        from recommendations.services import create_mock_recommendations
+
+        from ml_model.career_data import CAREER_REQUIREMENTS
+
+        self._add_assessments(6)
+        data = {"skills": ["Programming"], "interests": ["Technology & Innovation"]}
+        for _ in range(3):
+            assessment = Assessment.objects.create(
+                user=self.user, skills=data["skills"], interests=data["interests"],
+                education_level="Bachelor's Degree", work_style="Remote",
+            )
+            # The mock top career is in the catalog; only the note keeps it out
+            top = create_mock_recommendations(assessment, data)[0]
+            self.assertIn(top.career_name, CAREER_REQUIREMENTS)
+
+        result = update_from_assessments(self.artifact_dir)
+
+        self.assertEqual((result["rows"], result["skipped"]), (6, 3))
+        self.assertEqual(result["last_assessment_id"], assessment.id)
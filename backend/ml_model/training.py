@@ -0,0 +1,269 @@
+"""Model training: dataset, parallel model search and bundle output.
+
+Only decision trees are searched because serving evaluates the exported
+tree with ml_model.tree.CompiledTree; any candidate must be exportable
+into an artifact bundle. Each candidate is fitted on a stratified split
+and scored on the holdout. Its per-row latency is measured on the
+compiled evaluator, the way predict.py calls it. The most accurate
+candidate within the latency budget is refitted on all rows and written
+with bundle.write_bundle.
+
+Builds are content-addressed: build_hash() digests the career catalog,
+the training code, the configuration and seed (or the dataset file), and
+a bundle built from the same hash is reused instead of retrained.
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .bundle import activate_bundle, build_arrays, find_build, write_bundle
+from .career_data import CAREER_REQUIREMENTS, INTERESTS_LIST, SKILLS_LIST
+from .dataset import DEFAULT_CHUNK_SIZE, class_vocabularies, read_chunks, write_dataset
+from .features import CATEGORICAL_COLUMNS, encode_frame, skill_vocabulary
+from .tree import CompiledTree, export_tree
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRID = {
+    "criterion": ["gini", "entropy"],
+    "max_depth": [6, 8, 12, 16, None],
+    "min_samples_leaf": [1, 5, 20],
+}
+
+# Single-row calls timed per candidate when measuring latency
+LATENCY_SAMPLES = 200
+
+# Holdout rows densified at a time when scoring a candidate
+SCORE_CHUNK_ROWS = 4096
+
+# Modules whose code determines what a build produces
+TRAINING_MODULES = ("training.py", "dataset.py", "features.py", "tree.py", "bundle.py")
+ML_MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def build_hash(config: Dict, data_path: Optional[str] = None) -> str:
+    """Digest of everything a build depends on.
+
+    Covers CAREER_REQUIREMENTS, SKILLS_LIST and INTERESTS_LIST, the source
+    of TRAINING_MODULES, the library versions, ``config`` (search grid,
+    budget, seed, ...) and, for a supplied dataset, the file's bytes.
+    """
+    import sklearn
+
+    digest = hashlib.sha256()
+    inputs = {
+        "career_requirements": CAREER_REQUIREMENTS,
+        "skills_list": SKILLS_LIST,
+        "interests_list": INTERESTS_LIST,
+        "config": config,
+        "versions": {"numpy": np.__version__, "sklearn": sklearn.__version__},
+    }
+    digest.update(json.dumps(inputs, sort_keys=True, default=str).encode())
+    for module in TRAINING_MODULES:
+        with open(os.path.join(ML_MODEL_DIR, module), "rb") as f:
+            digest.update(f.read())
+    if data_path is not None:
+        with open(data_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _cached_build(output_root: str, digest: str, activate: bool) -> Optional[Dict]:
+    build_id = find_build(output_root, digest)
+    if build_id is None:
+        return None
+    if activate:
+        activate_bundle(output_root, build_id)
+    logger.info("Bundle %s already built from %s; skipping training", build_id, digest[:16])
+    return {"build_id": build_id, "build_hash": digest, "cached": True,
+            "selected": None, "results": [], "rows": None}
+
+
+def candidate_grid(grid: Optional[Dict[str, Sequence]] = None) -> List[Dict]:
+    """Expand a {param: [values]} grid into DecisionTreeClassifier keyword dicts."""
+    grid = grid or DEFAULT_GRID
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def load_training_matrix(path: str, vocabularies: Dict[str, Sequence[str]], skills: Sequence[str],
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """Encode a dataset CSV chunk by chunk; only the sparse matrix is kept in memory."""
+    parts = [encode_frame(chunk, vocabularies, skills) for chunk in read_chunks(path, chunk_size)]
+    if not parts:
+        raise ValueError(f"Training data {path} is empty")
+    X = sparse.vstack([X for X, _ in parts], format="csr")
+    y = np.concatenate([y for _, y in parts])
+    return X, y
+
+
+def _measure_latency_ms(tree: CompiledTree, rows: np.ndarray) -> float:
+    """Median milliseconds for one single-row predict_proba call."""
+    timings = []
+    for row in rows:
+        started = time.perf_counter()
+        tree.predict_proba(row)
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings) * 1000)
+
+
+def predict_in_chunks(tree: CompiledTree, X, chunk_rows: int = SCORE_CHUNK_ROWS) -> np.ndarray:
+    """tree.predict over ``X``; a sparse ``X`` is made dense ``chunk_rows`` rows at a time."""
+    if not sparse.issparse(X):
+        return tree.predict(X)
+    X = X.tocsr()
+    return np.concatenate([
+        tree.predict(X[start:start + chunk_rows].toarray())
+        for start in range(0, X.shape[0], chunk_rows)
+    ])
+
+
+def evaluate_candidate(params: Dict, X_train, y_train, X_test, y_test, latency_rows: np.ndarray,
+                       random_state: int = 42) -> Dict:
+    """Fit one candidate and return its fit time, holdout accuracy and per-row latency."""
+    from sklearn.tree import DecisionTreeClassifier
+
+    model = DecisionTreeClassifier(random_state=random_state, **params)
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+
+    tree = CompiledTree.from_model(model)
+    predicted = predict_in_chunks(tree, X_test)
+    return {
+        "params": params,
+        "fit_seconds": round(fit_seconds, 4),
+        "accuracy": round(float(np.mean(predicted == y_test)), 4),
+        "latency_ms_per_row": round(_measure_latency_ms(tree, latency_rows), 4),
+        "n_nodes": int(model.tree_.node_count),
+        "depth": int(model.get_depth()),
+    }
+
+
+def search(X, y, candidates: List[Dict], n_jobs: int = -1, test_size: float = 0.2,
+           seed: int = 42) -> List[Dict]:
+    """Evaluate every candidate in parallel worker processes."""
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import train_test_split
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=seed, stratify=y
+    )
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(X_test.shape[0], size=min(LATENCY_SAMPLES, X_test.shape[0]), replace=False)
+    latency_rows = X_test[sample].toarray() if sparse.issparse(X_test) else X_test[sample]
+
+    return Parallel(n_jobs=n_jobs)(
+        delayed(evaluate_candidate)(params, X_train, y_train, X_test, y_test, latency_rows, seed)
+        for params in candidates
+    )
+
+
+def select(results: List[Dict], latency_budget_ms: float) -> Optional[Dict]:
+    """Most accurate result within the budget.
+
+    Ties go to the smaller tree, then the faster one; node counts are
+    deterministic, timings are not.
+    """
+    eligible = [r for r in results if r["latency_ms_per_row"] <= latency_budget_ms]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda r: (r["accuracy"], -r["n_nodes"], -r["latency_ms_per_row"]))
+
+
+def train_and_write(data_path: str, output_root: str, candidates: Optional[List[Dict]] = None,
+                    latency_budget_ms: float = 1.0, n_jobs: int = -1, test_size: float = 0.2,
+                    seed: int = 42, chunk_size: int = DEFAULT_CHUNK_SIZE, activate: bool = True,
+                    metadata: Optional[Dict] = None, digest: Optional[str] = None,
+                    force: bool = False) -> Dict:
+    """Search, refit the selected candidate on every row and write it as a bundle.
+
+    Returns ``{"build_id", "build_hash", "cached", "selected", "results",
+    "rows"}``. ``digest`` defaults to build_hash() over the config and the
+    dataset file; unless ``force`` is set an existing bundle with that hash
+    is activated instead of retraining. Raises ValueError when no
+    candidate fits the latency budget.
+    """
+    from sklearn.tree import DecisionTreeClassifier
+
+    candidates = candidates or candidate_grid()
+    if digest is None:
+        config = {"candidates": candidates, "latency_budget_ms": latency_budget_ms,
+                  "test_size": test_size, "seed": seed}
+        digest = build_hash(config, data_path)
+    if not force:
+        cached = _cached_build(output_root, digest, activate)
+        if cached is not None:
+            return cached
+
+    vocabularies = class_vocabularies(CAREER_REQUIREMENTS)
+    skills = skill_vocabulary(SKILLS_LIST)
+    X, y = load_training_matrix(data_path, vocabularies, skills, chunk_size)
+
+    results = search(X, y, candidates, n_jobs=n_jobs, test_size=test_size, seed=seed)
+    selected = select(results, latency_budget_ms)
+    if selected is None:
+        fastest = min(r["latency_ms_per_row"] for r in results)
+        raise ValueError(
+            f"No candidate fits the {latency_budget_ms}ms latency budget (fastest: {fastest}ms)"
+        )
+
+    model = DecisionTreeClassifier(random_state=seed, **selected["params"])
+    model.fit(X, y)
+
+    arrays = build_arrays(
+        export_tree(model),
+        career_labels=vocabularies["career"],
+        education_classes=vocabularies["education"],
+        work_style_classes=vocabularies["work_style"],
+        interest_classes=vocabularies["interest"],
+        skills_list=skills,
+        interests_list=INTERESTS_LIST,
+    )
+    build_metadata = {
+        "feature_columns": CATEGORICAL_COLUMNS + skills,
+        "training_rows": int(X.shape[0]),
+        "latency_budget_ms": latency_budget_ms,
+        "selected": selected,
+        "search": results,
+    }
+    build_metadata.update(metadata or {})
+    build_id = write_bundle(output_root, arrays, metadata=build_metadata, activate=activate, build_hash=digest)
+    logger.info("Wrote model bundle %s (%s)", build_id, selected["params"])
+    return {"build_id": build_id, "build_hash": digest, "cached": False,
+            "selected": selected, "results": results, "rows": int(X.shape[0])}
+
+
+def generate_and_train(data_path: str, output_root: str, rows_per_career: int = 25, seed: int = 42,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1,
+                       candidates: Optional[List[Dict]] = None, latency_budget_ms: float = 1.0,
+                       test_size: float = 0.2, activate: bool = True, force: bool = False,
+                       **options) -> Dict:
+    """Write the synthetic dataset to ``data_path``, then train_and_write() on it.
+
+    The generator is seeded, so the config alone determines the data and
+    the build hash is computed before anything is generated; a cache hit
+    skips both steps.
+    """
+    candidates = candidates or candidate_grid()
+    config = {"candidates": candidates, "latency_budget_ms": latency_budget_ms, "test_size": test_size,
+              "seed": seed, "rows_per_career": rows_per_career, "chunk_size": chunk_size}
+    digest = build_hash(config)
+    if not force:
+        cached = _cached_build(output_root, digest, activate)
+        if cached is not None:
+            return cached
+
+    write_dataset(data_path, CAREER_REQUIREMENTS, rows_per_career=rows_per_career, seed=seed,
+                  chunk_size=chunk_size, workers=workers)
+    return train_and_write(data_path, output_root, candidates=candidates, latency_budget_ms=latency_budget_ms,
+                           test_size=test_size, seed=seed, chunk_size=chunk_size, activate=activate,
+                           digest=digest, force=True, **options)
@@ -0,0 +1,110 @@
+"""Pure-NumPy evaluation of a fitted decision tree.
+
+export_tree() flattens a fitted sklearn DecisionTreeClassifier into a few
+compact arrays; CompiledTree evaluates them for one row or a whole batch
+without going through sklearn's input validation. Nothing in this module
+imports sklearn.
+"""
+from typing import Dict
+
+import numpy as np
+
+# sklearn marks leaves with -1 children and a -2 feature
+TREE_LEAF = -1
+
+TREE_ARRAYS = ("feature", "threshold", "children_left", "children_right", "value", "classes")
+
+
+def export_tree(model) -> Dict[str, np.ndarray]:
+    """Flatten a fitted DecisionTreeClassifier into plain NumPy arrays.
+
+    ``value`` holds the normalised class distribution of every node so that
+    a leaf's row is exactly what predict_proba returns for it.
+    """
+    tree = model.tree_
+    if tree.n_outputs != 1:
+        raise ValueError("Only single-output trees can be compiled")
+
+    value = np.asarray(tree.value[:, 0, :], dtype=np.float64)
+    totals = value.sum(axis=1, keepdims=True)
+    totals[totals == 0.0] = 1.0
+
+    return {
+        "feature": np.asarray(tree.feature, dtype=np.int32),
+        "threshold": np.asarray(tree.threshold, dtype=np.float64),
+        "children_left": np.asarray(tree.children_left, dtype=np.int32),
+        "children_right": np.asarray(tree.children_right, dtype=np.int32),
+        "value": value / totals,
+        "classes": np.asarray(model.classes_),
+    }
+
+
+class CompiledTree:
+    """Decision tree evaluator backed only by NumPy arrays."""
+
+    def __init__(self, feature, threshold, children_left, children_right, value, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.value = value
+        self.classes = classes
+
+        self.is_leaf = children_left == TREE_LEAF
+        # Leaves carry feature -2; point them at column 0 so gathers stay in bounds
+        self._safe_feature = np.where(self.is_leaf, 0, feature).astype(np.intp)
+        self.n_classes = value.shape[1]
+        self.max_depth = self._depth()
+        # Columns the tree actually tests; rows that agree on them share a leaf
+        self.used_features = np.unique(feature[~self.is_leaf]).astype(np.intp)
+
+    @classmethod
+    def from_model(cls, model) -> "CompiledTree":
+        return cls(**export_tree(model))
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "CompiledTree":
+        return cls(**{name: arrays[name] for name in TREE_ARRAYS})
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in TREE_ARRAYS}
+
+    def _depth(self) -> int:
+        depth = np.zeros(len(self.feature), dtype=np.intp)
+        # Children always have larger ids than their parent in sklearn trees
+        for node in range(len(self.feature)):
+            if not self.is_leaf[node]:
+                depth[self.children_left[node]] = depth[node] + 1
+                depth[self.children_right[node]] = depth[node] + 1
+        return int(depth.max()) if len(depth) else 0
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Return the leaf index reached by every row of X."""
+        # sklearn compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        rows = np.arange(X.shape[0])
+        node = np.zeros(X.shape[0], dtype=np.intp)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self._safe_feature[node]] <= self.threshold[node]
+            child = np.where(go_left, self.children_left[node], self.children_right[node])
+            node = np.where(self.is_leaf[node], node, child)
+        return node
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities aligned with ``classes``, one row per input row."""
+        return self.value[self.apply(X)]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def save_tree(path: str, tree: CompiledTree) -> None:
+    np.savez(path, **tree.to_arrays())
+
+
+def load_tree(path: str) -> CompiledTree:
+    with np.load(path, allow_pickle=False) as arrays:
+        return CompiledTree.from_arrays(arrays)
@@ -0,0 +1,8 @@
+from django.urls import re_path
+from . import views
+
+# Probes are often configured without a trailing slash; accept both
+urlpatterns = [
+    re_path(r'^ready/?$', views.health_ready, name='health_ready'),
+    re_path(r'^live/?$', views.health_live, name='health_live'),
+]
@@ -1,3 +1,47 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 
-# Create your views here.
+from . import engine
+from .health import liveness, needs_warm_up, readiness
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def health_ready(request):
+    """
+    Readiness probe for the load balancer
+
+    Loads and warms the model if that has not happened yet (ML_PRELOAD
+    disabled) or the previous attempt failed.
+
+    Method: GET
+    URL: /api/health/ready
+
+    Response (200 when warm, 503 otherwise):
+    {
+        "status": "ready",
+        "model": {"fingerprint": "...", "build_id": "...", "load_ms": 1.9, ...},
+        "warmup": {"latency_ms": 4.2, "completed_at": 1730000000.0, "error": null}
+    }
+    """
+    if needs_warm_up():
+        engine.preload()
+    ready, payload = readiness()
+    return Response(
+        payload,
+        status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def health_live(request):
+    """
+    Liveness probe: the process is up and serving requests
+
+    Method: GET
+    URL: /api/health/live
+    """
+    return Response(liveness(), status=status.HTTP_200_OK)
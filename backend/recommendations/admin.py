@@ -1,6 +1,8 @@
 
 from django.contrib import admin
-from .models import Assessment, Recommendation, CareerDetail
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from .models import Assessment, PredictionResult, Recommendation, CareerDetail
 
 
 class RecommendationInline(admin.TabularInline):
@@ -11,13 +13,18 @@ class RecommendationInline(admin.TabularInline):
     can_delete = False
 
 
+class ResultRecommendationInline(RecommendationInline):
+    # Rankings shared by deduplicated assessments belong to the PredictionResult
+    fk_name = 'result'
+
+
 @admin.register(Assessment)
 class AssessmentAdmin(admin.ModelAdmin):
     
     list_display = ('id', 'user', 'created_at', 'education_level', 'work_style')
     list_filter = ('education_level', 'work_style', 'created_at')
     search_fields = ('user__username', 'user__email')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'shared_result', 'shared_ranking')
     
     fieldsets = (
         ('User Information', {
@@ -26,6 +33,9 @@ class AssessmentAdmin(admin.ModelAdmin):
         ('Assessment Data', {
             'fields': ('skills', 'interests', 'education_level', 'work_style')
         }),
+        ('Shared Ranking', {
+            'fields': ('shared_result', 'shared_ranking')
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)  # Collapsible section
@@ -34,6 +44,25 @@ class AssessmentAdmin(admin.ModelAdmin):
     
     inlines = [RecommendationInline]  # Show recommendations on same page
     
+    @admin.display(description='Prediction result')
+    def shared_result(self, obj):
+        if obj.prediction_result_id is None:
+            return '-'
+        url = reverse('admin:recommendations_predictionresult_change', args=[obj.prediction_result_id])
+        return format_html('<a href="{}">{}</a>', url, obj.prediction_result)
+    
+    @admin.display(description='Recommendations')
+    def shared_ranking(self, obj):
+        """
+        The inline only lists rows owned by the assessment itself
+        """
+        if obj.prediction_result_id is None:
+            return '-'
+        return format_html_join(
+            format_html('<br>'), '#{} {} ({}%)',
+            ((r.rank, r.career_name, r.match_score) for r in obj.ranking)
+        )
+    
     def has_add_permission(self, request):
         """
         Disable manual creation (assessments come from API)
@@ -41,16 +70,27 @@ class AssessmentAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(PredictionResult)
+class PredictionResultAdmin(admin.ModelAdmin):
+    list_display = ('id', 'input_hash', 'model_version', 'created_at')
+    search_fields = ('input_hash', 'model_version')
+    readonly_fields = ('input_hash', 'model_version', 'created_at')
+    inlines = [ResultRecommendationInline]
+    
+    def has_add_permission(self, request):
+        return False
+
+
 @admin.register(Recommendation)
 class RecommendationAdmin(admin.ModelAdmin):
-    list_display = ('id', 'assessment', 'rank', 'career_name', 'match_score', 'confidence_level')
+    list_display = ('id', 'assessment', 'result', 'rank', 'career_name', 'match_score', 'confidence_level')
     list_filter = ('confidence_level', 'created_at')
     search_fields = ('career_name', 'assessment__user__username')
     readonly_fields = ('created_at',)
     
     fieldsets = (
         ('Basic Info', {
-            'fields': ('assessment', 'career_name', 'rank')
+            'fields': ('assessment', 'result', 'career_name', 'rank')
         }),
         ('ML Output', {
             'fields': ('match_score', 'confidence_level', 'completeness_percent')
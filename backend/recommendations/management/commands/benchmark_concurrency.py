@@ -0,0 +1,141 @@
+import os
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+
+from ml_model import engine
+from recommendations.services import create_assessment_with_recommendations, get_user_assessment_history
+
+from .benchmark_history import SAMPLE
+
+ASSESSMENT = {
+    'skills': SAMPLE['skills'],
+    'interests': SAMPLE['interests'],
+    'education': SAMPLE['education_level'],
+    'work_style': SAMPLE['work_style'],
+}
+
+MODES = {
+    # Django's stock backend: rollback journal, deferred transactions
+    "stock sqlite3": {'ENGINE': 'django.db.backends.sqlite3', 'OPTIONS': {}},
+    "tuned (WAL + write lock)": {
+        'ENGINE': 'career_api.db_backends.sqlite3',
+        'OPTIONS': {'pragmas': {}, 'serialize_writes': True},
+    },
+}
+
+
+def _configure_default(settings_dict):
+    """Replace the default alias settings; this thread reconnects lazily."""
+    connections.close_all()
+    connections.settings['default'] = settings_dict
+    try:
+        del connections['default']
+    except AttributeError:
+        # This thread never opened the alias
+        pass
+
+
+@contextmanager
+def scratch_database(path, engine_settings):
+    """Point the default alias at a fresh migrated file; restored afterwards."""
+    original = connections.settings['default']
+    _configure_default(dict(original, NAME=path, **engine_settings))
+    try:
+        call_command('migrate', verbosity=0)
+        yield
+    finally:
+        _configure_default(original)
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent assessment submissions and history reads against a scratch "
+        "SQLite file, with Django's stock backend and with the tuned backend, and report "
+        "throughput, p99 latency and 'database is locked' errors"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8, help="Threads submitting assessments")
+        parser.add_argument("--readers", type=int, default=8, help="Threads reading history pages")
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run")
+        parser.add_argument("--mode", choices=sorted(MODES), action="append",
+                            help="Run only this mode (repeatable); default runs both")
+
+    def worker(self, operation, deadline, timings, errors):
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    operation()
+                except OperationalError:
+                    errors.append(1)
+                else:
+                    timings.append(time.perf_counter() - started)
+        finally:
+            connections.close_all()
+
+    def run(self, options):
+        users = [
+            get_user_model().objects.create_user(f"bench-{i}@example.com", f"bench-{i}", None)
+            for i in range(max(options["writers"], options["readers"]))
+        ]
+        # Readers start with a history to page through
+        for user in users:
+            create_assessment_with_recommendations(user, ASSESSMENT)
+
+        results = {"write": ([], []), "read": ([], [])}
+        deadline = time.perf_counter() + options["seconds"]
+        threads = []
+        for i in range(options["writers"]):
+            user = users[i]
+            threads.append(threading.Thread(target=self.worker, args=(
+                lambda user=user: create_assessment_with_recommendations(user, ASSESSMENT),
+                deadline, *results["write"])))
+        for i in range(options["readers"]):
+            user = users[i]
+            threads.append(threading.Thread(target=self.worker, args=(
+                lambda user=user: list(get_user_assessment_history(user)[:20]),
+                deadline, *results["read"])))
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        for kind, (timings, errors) in results.items():
+            self.stdout.write(
+                f"  {kind:<5} {len(timings) / elapsed:9.1f} ops/s  "
+                f"p50 {statistics.median(timings) * 1000 if timings else 0:8.2f}ms  "
+                f"p99 {percentile(timings, 99) * 1000:8.2f}ms  "
+                f"{len(errors):>5} locked errors"
+            )
+
+    def handle(self, *args, **options):
+        if engine.is_available():
+            # Load the model before the clock starts
+            engine.preload()
+
+        for label in options["mode"] or list(MODES):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{label}: {options['writers']} writers, {options['readers']} readers, {options['seconds']}s"
+            ))
+            with tempfile.TemporaryDirectory() as directory:
+                with scratch_database(os.path.join(directory, "bench.sqlite3"), MODES[label]):
+                    self.run(options)
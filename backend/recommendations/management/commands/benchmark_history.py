@@ -0,0 +1,102 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from recommendations.models import Assessment, Recommendation, Vocabulary
+from recommendations.serializers import AssessmentListSerializer
+from recommendations.services import get_user_assessment_history
+from recommendations.vocabulary import encode_codes, encode_masks
+
+SAMPLE = {
+    'skills': ['Programming', 'Data Analysis', 'Communication'],
+    'interests': ['Technology & Innovation', 'Problem Solving'],
+    'education_level': "Bachelor's Degree",
+    'work_style': 'Remote',
+}
+
+
+def seed_history(user, count, recommendations=5, batch_size=2000):
+    """Bulk-insert ``count`` assessments with ranked recommendations for ``user``."""
+    masks = {
+        **encode_masks(Vocabulary.SKILL, SAMPLE['skills']),
+        **encode_masks(Vocabulary.INTEREST, SAMPLE['interests']),
+    }
+    matching_codes = encode_codes(Vocabulary.SKILL, SAMPLE['skills'][:2])
+    missing_codes = encode_codes(Vocabulary.SKILL, ['Git'])
+    for start in range(0, count, batch_size):
+        assessments = Assessment.objects.bulk_create([
+            Assessment(user=user, **SAMPLE, **masks) for _ in range(min(batch_size, count - start))
+        ])
+        Recommendation.objects.bulk_create([
+            Recommendation(
+                assessment=assessment,
+                career_name=f'Career {rank}',
+                match_score=95 - rank,
+                confidence_level='High',
+                rank=rank,
+                matching_skills=SAMPLE['skills'][:2],
+                missing_skills=['Git'],
+                matching_skill_codes=matching_codes,
+                missing_skill_codes=missing_codes,
+                completeness_percent=50,
+                rationale={},
+            )
+            for assessment in assessments
+            for rank in range(1, recommendations + 1)
+        ], batch_size=batch_size)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed users with long assessment histories (rolled back afterwards) and compare "
+        "queries/latency of the per-row history serializer with the annotated queryset"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=3)
+        parser.add_argument("--assessments", type=int, default=1000, help="Assessments per user")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--keep", action="store_true", help="Commit the seeded rows instead of rolling back")
+
+    def _measure(self, build_queryset, users, repeat):
+        timings = []
+        queries = 0
+        for _ in range(repeat):
+            for user in users:
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    AssessmentListSerializer(build_queryset(user), many=True).data
+                    timings.append(time.perf_counter() - started)
+                queries = len(captured)
+        return statistics.median(timings) * 1000, queries
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        with transaction.atomic():
+            started = time.perf_counter()
+            users = []
+            for i in range(options["users"]):
+                user = User.objects.create_user(f"bench-history-{i}-{time.time_ns()}@example.com",
+                                                f"bench-history-{i}-{time.time_ns()}", None)
+                seed_history(user, options["assessments"])
+                users.append(user)
+            self.stdout.write(
+                f"Seeded {options['users']} users x {options['assessments']} assessments "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+
+            paths = {
+                "per-row (prefetch + .filter/.count)": lambda user: Assessment.objects.filter(
+                    user=user).prefetch_related('recommendations').order_by('-created_at'),
+                "annotated (correlated subqueries)": get_user_assessment_history,
+            }
+            for label, build_queryset in paths.items():
+                median_ms, queries = self._measure(build_queryset, users, options["repeat"])
+                self.stdout.write(f"{label:<38} {queries:>6} queries  {median_ms:9.1f}ms per history")
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
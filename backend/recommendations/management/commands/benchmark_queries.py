@@ -0,0 +1,116 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from recommendations.models import CareerDetail, Recommendation
+from recommendations.pagination import AssessmentHistoryPagination, CareerPagination
+from recommendations.services import get_user_assessment_history
+
+from .benchmark_history import seed_history
+
+# Indexes added in 0002; --compare drops them (inside the rolled-back transaction)
+COMPOSITE_INDEXES = ('assessment_user_created_idx', 'recommendation_assess_rank_idx')
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large dataset and print the query plan and median latency of the query "
+        "behind every recommendations endpoint. Seeded rows are rolled back unless --keep."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--assessments", type=int, default=100_000,
+                            help="Total assessments, spread evenly over the users (5 recommendations each)")
+        parser.add_argument("--careers", type=int, default=5_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--compare", action="store_true",
+                            help="Measure again with the composite indexes dropped")
+        parser.add_argument("--keep", action="store_true",
+                            help="Commit the seeded rows instead of rolling back (ignored with --compare)")
+
+    def seed(self, options):
+        User = get_user_model()
+        stamp = time.time_ns()
+        started = time.perf_counter()
+        users = User.objects.bulk_create([
+            User(email=f"bench-{stamp}-{i}@example.com", username=f"bench-{stamp}-{i}")
+            for i in range(options["users"])
+        ])
+        per_user = max(1, options["assessments"] // len(users))
+        for done, user in enumerate(users, start=1):
+            seed_history(user, per_user)
+            if done % max(1, len(users) // 10) == 0:
+                self.stdout.write(f"  seeded {done * per_user:,} assessments "
+                                  f"({time.perf_counter() - started:.0f}s)")
+        CareerDetail.objects.bulk_create([
+            CareerDetail(career_name=f"Bench career {stamp}-{i:07d}", description="", requirements={},
+                         salary_info={}, job_growth="", work_environment="")
+            for i in range(options["careers"])
+        ], batch_size=2000)
+        self.stdout.write(f"Seeded {len(users)} users, {len(users) * per_user:,} assessments, "
+                          f"{len(users) * per_user * 5:,} recommendations and {options['careers']:,} careers "
+                          f"in {time.perf_counter() - started:.1f}s")
+        return users[0]
+
+    def endpoint_queries(self, user):
+        """The queryset each endpoint runs, as the views build them."""
+        history = AssessmentHistoryPagination()
+        history_qs = get_user_assessment_history(user).order_by(*history.ordering)
+        middle = history_qs[history_qs.count() // 2]
+        careers = CareerPagination()
+        career_qs = CareerDetail.objects.order_by(*careers.ordering)
+        career_middle = career_qs.values_list('career_name', flat=True)[career_qs.count() // 2]
+        page = 20
+
+        return {
+            "history, first page": history_qs[:page + 1],
+            "history, deep page": history_qs.filter(
+                history.keyset_filter([middle.created_at, middle.id]))[:page + 1],
+            "assessment detail, recommendations": Recommendation.objects.filter(assessment_id=middle.id),
+            "career list, deep page": career_qs.filter(careers.keyset_filter([career_middle]))[:page + 1],
+            "career detail": CareerDetail.objects.filter(career_name=career_middle),
+        }
+
+    def explain(self, queryset, tag):
+        # The tag makes the SQL text unique per pass: SQLite keeps serving a
+        # cached EXPLAIN plan after DROP INDEX if the statement is identical
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql} /* {tag} */", params)
+            return [" ".join(str(column) for column in row) for row in cursor.fetchall()]
+
+    def measure(self, queries, repeat, tag):
+        for label, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append(time.perf_counter() - started)
+            self.stdout.write(f"\n{label}: {statistics.median(timings) * 1000:.3f}ms median")
+            for line in self.explain(queryset, tag):
+                self.stdout.write(f"    {line}")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.seed(options)
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+            queries = self.endpoint_queries(user)
+
+            self.stdout.write(self.style.MIGRATE_HEADING("\nWith composite indexes"))
+            self.measure(queries, options["repeat"], "indexed")
+
+            if options["compare"]:
+                with connection.cursor() as cursor:
+                    for name in COMPOSITE_INDEXES:
+                        cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+                self.stdout.write(self.style.MIGRATE_HEADING("\nWithout composite indexes"))
+                self.measure(queries, options["repeat"], "unindexed")
+
+            # --compare dropped the indexes, so never commit after it
+            if options["compare"] or not options["keep"]:
+                transaction.set_rollback(True)
@@ -0,0 +1,42 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database into the replica file (settings.DATABASE_REPLICA) "
+        "with the online backup API; with --interval, keep doing so to emulate replication lag"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=None,
+                            help="Seconds between copies; runs until interrupted")
+        parser.add_argument("--pages", type=int, default=1024,
+                            help="Pages copied per step, so writers are not held up by one long copy")
+
+    def sync(self, source_path, replica_path, pages):
+        started = time.perf_counter()
+        source = sqlite3.connect(source_path)
+        replica = sqlite3.connect(replica_path)
+        try:
+            source.backup(replica, pages=pages)
+        finally:
+            replica.close()
+            source.close()
+        self.stdout.write(f"Replica synced in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    def handle(self, *args, **options):
+        alias = settings.DATABASE_REPLICA_ALIAS
+        if alias is None:
+            raise CommandError("No replica configured; set DATABASE_REPLICA to the replica file path")
+        source_path = str(settings.DATABASES[DEFAULT_DB_ALIAS]['NAME'])
+        replica_path = str(settings.DATABASES[alias]['NAME'])
+
+        self.sync(source_path, replica_path, options["pages"])
+        while options["interval"]:
+            time.sleep(options["interval"])
+            self.sync(source_path, replica_path, options["pages"])
@@ -0,0 +1,55 @@
+# Generated by Django 4.2 on 2026-10-18 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0002_assessment_recommendation_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Vocabulary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('skill', 'Skill'), ('interest', 'Interest')], max_length=20)),
+                ('term', models.CharField(max_length=100)),
+                ('code', models.PositiveSmallIntegerField(help_text='Bit position in Assessment masks, value in Recommendation code arrays')),
+            ],
+            options={
+                'verbose_name': 'Vocabulary term',
+                'verbose_name_plural': 'Vocabulary',
+                'ordering': ['kind', 'code'],
+            },
+        ),
+        migrations.AddField(
+            model_name='assessment',
+            name='interest_mask',
+            field=models.BigIntegerField(default=0, help_text='Bit i set if the interest with vocabulary code i is in interests'),
+        ),
+        migrations.AddField(
+            model_name='assessment',
+            name='skill_mask',
+            field=models.BigIntegerField(default=0, help_text='Bit i set if the skill with vocabulary code i is in skills'),
+        ),
+        migrations.AddField(
+            model_name='recommendation',
+            name='matching_skill_codes',
+            field=models.JSONField(default=list, help_text='Vocabulary codes of matching_skills'),
+        ),
+        migrations.AddField(
+            model_name='recommendation',
+            name='missing_skill_codes',
+            field=models.JSONField(default=list, help_text='Vocabulary codes of missing_skills'),
+        ),
+        migrations.AddConstraint(
+            model_name='vocabulary',
+            constraint=models.UniqueConstraint(fields=('kind', 'term'), name='vocabulary_kind_term_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='vocabulary',
+            constraint=models.UniqueConstraint(fields=('kind', 'code'), name='vocabulary_kind_code_unique'),
+        ),
+    ]
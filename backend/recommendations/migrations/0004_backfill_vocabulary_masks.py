@@ -0,0 +1,108 @@
+from django.db import migrations, transaction
+
+BATCH_SIZE = 2000
+
+# Same as recommendations.vocabulary.MASK_BITS
+MASK_BITS = 63
+
+# Catalog terms in code order as of this migration (form options first, then
+# terms only careers use). Frozen here so the migration does not change when
+# the catalog does; terms added later get their codes from vocabulary_codes.
+SKILL_TERMS = [
+    'Programming', 'Data Analysis', 'Web Development', 'Mobile Development', 'Database Management',
+    'Cloud Computing', 'Cybersecurity', 'DevOps', 'Machine Learning', 'Network Administration',
+    'System Architecture', 'Graphic Design', 'Video Editing', 'UI/UX Design', 'Content Writing',
+    'Photography', 'Animation', '3D Modeling', 'Creative Writing', 'Project Management', 'Marketing',
+    'Sales', 'Financial Analysis', 'Business Strategy', 'Leadership', 'Public Speaking', 'Negotiation',
+    'Patient Care', 'Medical Knowledge', 'Healthcare Management', 'Clinical Skills', 'Medical Research',
+    'CAD Design', 'Engineering Analysis', 'Quality Control', 'Manufacturing', 'Technical Documentation',
+    'Adobe Creative Suite', 'Adobe XD', 'Agile', 'Analytics', 'Color Theory', 'Communication',
+    'Content Strategy', 'Data Structures', 'Data Visualization', 'Debugging', 'Ethical Hacking', 'Excel',
+    'Figma', 'Git', 'Grammar', 'HTML/CSS', 'JavaScript', 'Network Security', 'Problem Solving',
+    'Product Strategy', 'Prototyping', 'Python', 'React', 'Research', 'Risk Assessment', 'SEO', 'SQL',
+    'Social Media', 'Statistics', 'Storytelling', 'Typography', 'User Research',
+]
+INTEREST_TERMS = [
+    'Technology & Innovation', 'Science & Research', 'Arts & Design', 'Business & Entrepreneurship',
+    'Healthcare & Medicine', 'Education & Social Services', 'Law & Public Policy', 'Sports & Fitness',
+    'Environment & Sustainability', 'Media & Communications', 'Engineering & Manufacturing',
+    'Finance & Investment', 'Analytics', 'Problem Solving', 'Creative Problem Solving', 'Communication',
+    'Creativity', 'Psychology', 'Security', 'Visual Communication', 'Writing',
+]
+
+
+def _sync_vocabulary(vocabulary, alias):
+    """Give every frozen term without a code the next free one; return {kind: {term: code}}."""
+    codes = {}
+    for kind, terms in (('skill', SKILL_TERMS), ('interest', INTEREST_TERMS)):
+        known = dict(vocabulary.objects.using(alias).filter(kind=kind).values_list('term', 'code'))
+        next_code = max(known.values(), default=-1) + 1
+        new_terms = [term for term in terms if term not in known]
+        vocabulary.objects.using(alias).bulk_create([
+            vocabulary(kind=kind, term=term, code=next_code + i) for i, term in enumerate(new_terms)
+        ])
+        known.update((term, next_code + i) for i, term in enumerate(new_terms))
+        codes[kind] = known
+    return codes
+
+
+def _mask(codes, terms):
+    mask = 0
+    for term in terms:
+        code = codes.get(term)
+        if code is not None and code < MASK_BITS:
+            mask |= 1 << code
+    return mask
+
+
+def _codes(codes, terms):
+    return [codes[term] for term in terms if term in codes]
+
+
+def _backfill(model, alias, fields, encode):
+    """bulk_update ``fields`` of every row in id order, one transaction per batch."""
+    last_id = 0
+    while True:
+        batch = list(model.objects.using(alias).filter(id__gt=last_id).order_by('id')[:BATCH_SIZE])
+        if not batch:
+            return
+        for row in batch:
+            encode(row)
+        with transaction.atomic(using=alias):
+            model.objects.using(alias).bulk_update(batch, fields)
+        last_id = batch[-1].id
+
+
+def backfill(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    with transaction.atomic(using=alias):
+        codes = _sync_vocabulary(apps.get_model('recommendations', 'Vocabulary'), alias)
+    skills, interests = codes['skill'], codes['interest']
+
+    def encode_assessment(assessment):
+        assessment.skill_mask = _mask(skills, assessment.skills or [])
+        assessment.interest_mask = _mask(interests, assessment.interests or [])
+
+    def encode_recommendation(recommendation):
+        recommendation.matching_skill_codes = _codes(skills, recommendation.matching_skills or [])
+        recommendation.missing_skill_codes = _codes(skills, recommendation.missing_skills or [])
+
+    _backfill(apps.get_model('recommendations', 'Assessment'), alias, ['skill_mask', 'interest_mask'],
+              encode_assessment)
+    _backfill(apps.get_model('recommendations', 'Recommendation'), alias,
+              ['matching_skill_codes', 'missing_skill_codes'], encode_recommendation)
+
+
+class Migration(migrations.Migration):
+
+    # Each batch commits on its own so a large table is never locked by one
+    # long transaction, and an interrupted run can simply be re-run
+    atomic = False
+
+    dependencies = [
+        ('recommendations', '0003_vocabulary_masks'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-18 19:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0004_backfill_vocabulary_masks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('input_hash', models.CharField(max_length=64)),
+                ('model_version', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Prediction Result',
+                'verbose_name_plural': 'Prediction Results',
+            },
+        ),
+        migrations.AddField(
+            model_name='assessment',
+            name='input_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='Content hash of skills, interests, education and work style', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='recommendation',
+            name='assessment',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='recommendations.assessment'),
+        ),
+        migrations.AddField(
+            model_name='assessment',
+            name='prediction_result',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='assessments', to='recommendations.predictionresult'),
+        ),
+        migrations.AddField(
+            model_name='recommendation',
+            name='result',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='recommendations.predictionresult'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(fields=['result', 'rank'], name='recommendation_result_rank_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='recommendation',
+            constraint=models.CheckConstraint(check=models.Q(('assessment__isnull', False), ('result__isnull', False), _connector='OR'), name='recommendation_has_owner'),
+        ),
+        migrations.AddConstraint(
+            model_name='predictionresult',
+            constraint=models.UniqueConstraint(fields=('input_hash', 'model_version'), name='prediction_result_input_model_unique'),
+        ),
+    ]
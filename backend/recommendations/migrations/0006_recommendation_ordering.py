@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 20:23
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0005_prediction_results'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='recommendation',
+            options={'ordering': ['rank'], 'verbose_name': 'Recommendation', 'verbose_name_plural': 'Recommendations'},
+        ),
+    ]
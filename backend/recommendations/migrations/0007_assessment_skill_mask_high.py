@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 20:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0006_recommendation_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessment',
+            name='skill_mask_high',
+            field=models.BigIntegerField(default=0, help_text='Bit i set if the skill with vocabulary code 63 + i is in skills'),
+        ),
+    ]
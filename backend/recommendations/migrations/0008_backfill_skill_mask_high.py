@@ -0,0 +1,50 @@
+from django.db import migrations, transaction
+
+BATCH_SIZE = 2000
+
+# Same as recommendations.vocabulary.MASK_BITS
+MASK_BITS = 63
+
+
+def backfill(apps, schema_editor):
+    """Set skill_mask_high from the codes 0004 already assigned; those skills got no bit there."""
+    alias = schema_editor.connection.alias
+    Vocabulary = apps.get_model('recommendations', 'Vocabulary')
+    Assessment = apps.get_model('recommendations', 'Assessment')
+
+    high = dict(
+        Vocabulary.objects.using(alias)
+        .filter(kind='skill', code__gte=MASK_BITS, code__lt=2 * MASK_BITS)
+        .values_list('term', 'code')
+    )
+    if not high:
+        return
+
+    last_id = 0
+    while True:
+        batch = list(Assessment.objects.using(alias).filter(id__gt=last_id).order_by('id')[:BATCH_SIZE])
+        if not batch:
+            return
+        for assessment in batch:
+            mask = 0
+            for skill in assessment.skills or []:
+                if skill in high:
+                    mask |= 1 << (high[skill] - MASK_BITS)
+            assessment.skill_mask_high = mask
+        with transaction.atomic(using=alias):
+            Assessment.objects.using(alias).bulk_update(batch, ['skill_mask_high'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    # One transaction per batch, as in 0004
+    atomic = False
+
+    dependencies = [
+        ('recommendations', '0007_assessment_skill_mask_high'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
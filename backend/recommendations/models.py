@@ -25,6 +25,43 @@ class Assessment(models.Model):
         help_text="List of user's interests"
     )
     
+    # Bitmasks of skills/interests by Vocabulary code (see vocabulary.py);
+    # filter with vocabulary.with_all_terms / with_any_term
+    skill_mask = models.BigIntegerField(
+        default=0,
+        help_text="Bit i set if the skill with vocabulary code i is in skills"
+    )
+    
+    # Codes MASK_BITS and up; a catalog this size has more than 63 skills
+    skill_mask_high = models.BigIntegerField(
+        default=0,
+        help_text="Bit i set if the skill with vocabulary code 63 + i is in skills"
+    )
+    
+    interest_mask = models.BigIntegerField(
+        default=0,
+        help_text="Bit i set if the interest with vocabulary code i is in interests"
+    )
+    
+    # sha256 of the normalized inputs (services.input_hash); identical
+    # submissions share one PredictionResult per model version
+    input_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        help_text="Content hash of skills, interests, education and work style"
+    )
+    
+    # Set when the ranking is a shared PredictionResult; older assessments
+    # and rankings that could not be shared own their Recommendation rows
+    prediction_result = models.ForeignKey(
+        'PredictionResult',
+        on_delete=models.PROTECT,  # Shared by many assessments
+        null=True,
+        blank=True,
+        related_name='assessments'
+    )
+    
     # Education level - single choice
     education_level = models.CharField(
         max_length=100,
@@ -45,17 +82,65 @@ class Assessment(models.Model):
         ordering = ['-created_at']  # Newest first
         verbose_name = 'Assessment'
         verbose_name_plural = 'Assessments'
+        indexes = [
+            # History: WHERE user_id = ? ORDER BY created_at DESC, id DESC,
+            # including the keyset seek to the next page
+            models.Index(fields=['user', '-created_at', '-id'], name='assessment_user_created_idx'),
+        ]
     
     def __str__(self):
         return f"Assessment by {self.user.username} on {self.created_at.strftime('%Y-%m-%d')}"
+    
+    @property
+    def ranking(self):
+        """This assessment's recommendations, wherever they are stored."""
+        if self.prediction_result_id is not None:
+            return Recommendation.objects.filter(result_id=self.prediction_result_id).order_by('rank')
+        return self.recommendations.order_by('rank')
+
+
+class PredictionResult(models.Model):
+    """One stored ranking for identical inputs scored by the same model.
+
+    Its Recommendation rows are written once and referenced by every
+    Assessment with the same input_hash and model_version.
+    """
+    
+    input_hash = models.CharField(max_length=64)
+    
+    # Fingerprint of the model artifacts that produced the ranking
+    model_version = models.CharField(max_length=64)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Prediction Result'
+        verbose_name_plural = 'Prediction Results'
+        constraints = [
+            models.UniqueConstraint(fields=['input_hash', 'model_version'], name='prediction_result_input_model_unique'),
+        ]
+    
+    def __str__(self):
+        return f"Result {self.input_hash[:12]} (model {self.model_version[:12]})"
 
 
 class Recommendation(models.Model):
     
-    # Link to Assessment (ForeignKey)
+    # Owner: an Assessment, or a PredictionResult shared by many assessments
     assessment = models.ForeignKey(
         Assessment,
         on_delete=models.CASCADE,  # If assessment deleted, delete recommendations
+        null=True,
+        blank=True,
+        related_name='recommendations'
+    )
+    
+    result = models.ForeignKey(
+        PredictionResult,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        db_index=False,  # Covered by recommendation_result_rank_idx
         related_name='recommendations'
     )
     
@@ -96,6 +181,17 @@ class Recommendation(models.Model):
         help_text="Skills user needs to learn for this career"
     )
     
+    # The same skills as Vocabulary codes, e.g. [0, 12]
+    matching_skill_codes = models.JSONField(
+        default=list,
+        help_text="Vocabulary codes of matching_skills"
+    )
+    
+    missing_skill_codes = models.JSONField(
+        default=list,
+        help_text="Vocabulary codes of missing_skills"
+    )
+    
     completeness_percent = models.DecimalField(
         max_digits=5,
         decimal_places=2,
@@ -113,9 +209,20 @@ class Recommendation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        ordering = ['assessment', 'rank']  # Order by assessment, then rank
+        ordering = ['rank']  # Owner is assessment or result; filter by it first
         verbose_name = 'Recommendation'
         verbose_name_plural = 'Recommendations'
+        indexes = [
+            # Detail page (ORDER BY rank) and the rank-1 subquery of the history
+            models.Index(fields=['assessment', 'rank'], name='recommendation_assess_rank_idx'),
+            models.Index(fields=['result', 'rank'], name='recommendation_result_rank_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(assessment__isnull=False) | models.Q(result__isnull=False),
+                name='recommendation_has_owner'
+            ),
+        ]
     
     def __str__(self):
         return f"#{self.rank} {self.career_name} ({self.match_score}%)"
@@ -178,3 +285,37 @@ class CareerDetail(models.Model):
     def __str__(self):
         return self.career_name
 
+
+
+class Vocabulary(models.Model):
+    """Stable integer code for every catalog skill and interest.
+
+    Codes are assigned once, in catalog order, and never reused or
+    renumbered, so stored masks and code arrays stay valid when the
+    catalog grows.
+    """
+    SKILL = 'skill'
+    INTEREST = 'interest'
+    
+    kind = models.CharField(
+        max_length=20,
+        choices=[(SKILL, 'Skill'), (INTEREST, 'Interest')]
+    )
+    
+    term = models.CharField(max_length=100)
+    
+    code = models.PositiveSmallIntegerField(
+        help_text="Bit position in Assessment masks, value in Recommendation code arrays"
+    )
+    
+    class Meta:
+        ordering = ['kind', 'code']
+        verbose_name = 'Vocabulary term'
+        verbose_name_plural = 'Vocabulary'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'term'], name='vocabulary_kind_term_unique'),
+            models.UniqueConstraint(fields=['kind', 'code'], name='vocabulary_kind_code_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} #{self.code}: {self.term}"
@@ -0,0 +1,131 @@
+"""
+Keyset (cursor) pagination for list endpoints
+
+Pages are selected with a WHERE clause on the ordering columns of the
+last row already returned, never with OFFSET, so page 1,000 costs the
+same index seek as page 1. The ordering must end in a unique column
+(id, career_name) to be a total order. Rows inserted while a client is
+paging sort before its cursor (newer created_at) and cannot shift or
+duplicate later pages.
+
+Response shape:
+{
+    "next": "http://.../api/assessment/history/?cursor=eyJ...",
+    "results": [...]
+}
+"""
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+DEFAULT_PAGINATION = {
+    'HISTORY_PAGE_SIZE': 20,
+    'CAREERS_PAGE_SIZE': 50,
+    'MAX_PAGE_SIZE': 100,
+}
+
+
+def pagination_setting(key):
+    config = dict(DEFAULT_PAGINATION)
+    config.update(getattr(settings, 'RECOMMENDATIONS_PAGINATION', {}))
+    return config[key]
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    # Subclasses set these; every field must be ordered in the same direction
+    ordering = ()
+    page_size_setting = None
+
+    def get_page_size(self, request):
+        page_size = pagination_setting(self.page_size_setting)
+        requested = request.query_params.get(self.page_size_query_param)
+        if requested:
+            try:
+                page_size = int(requested)
+            except ValueError:
+                pass
+        return max(1, min(page_size, pagination_setting('MAX_PAGE_SIZE')))
+
+    @property
+    def _fields(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    @property
+    def _descending(self):
+        return self.ordering[0].startswith('-')
+
+    def encode_cursor(self, instance):
+        values = [getattr(instance, field) for field in self._fields]
+        payload = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, queryset, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            if not isinstance(values, list) or len(values) != len(self._fields):
+                raise ValueError
+            model_fields = [queryset.model._meta.get_field(field) for field in self._fields]
+            return [field.to_python(value) for field, value in zip(model_fields, values)]
+        except (ValueError, TypeError, binascii.Error, UnicodeDecodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def keyset_filter(self, values):
+        """Rows strictly after ``values`` in the ordering, as one OR of column prefixes."""
+        lookup = 'lt' if self._descending else 'gt'
+        condition = Q()
+        for i, field in enumerate(self._fields):
+            prefix = {name: value for name, value in zip(self._fields[:i], values[:i])}
+            condition |= Q(**prefix, **{f'{field}__{lookup}': values[i]})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.keyset_filter(self.decode_cursor(queryset, cursor)))
+
+        # One extra row tells whether there is a next page without a COUNT
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+
+class AssessmentHistoryPagination(KeysetPagination):
+    # Newest first; id breaks ties between assessments created in the same instant
+    ordering = ('-created_at', '-id')
+    page_size_setting = 'HISTORY_PAGE_SIZE'
+
+
+class CareerPagination(KeysetPagination):
+    # career_name is unique
+    ordering = ('career_name',)
+    page_size_setting = 'CAREERS_PAGE_SIZE'
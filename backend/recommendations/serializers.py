@@ -64,7 +64,8 @@ class RecommendationSerializer(serializers.ModelSerializer):
 
 
 class AssessmentSerializer(serializers.ModelSerializer):
-    recommendations = RecommendationSerializer(many=True, read_only=True)
+    # Own rows or the shared PredictionResult's (Assessment.ranking)
+    recommendations = RecommendationSerializer(source='ranking', many=True, read_only=True)
     username = serializers.CharField(source='user.username', read_only=True)
     
     class Meta:
@@ -101,8 +102,17 @@ class AssessmentListSerializer(serializers.ModelSerializer):
             'recommendations_count'
         ]
     
+    # Querysets from services.get_user_assessment_history carry these values
+    # as annotations; anything else falls back to one query per assessment
     def get_top_recommendation(self, obj):
-        top_rec = obj.recommendations.filter(rank=1).first()
+        if hasattr(obj, 'top_career_name'):
+            if obj.top_career_name is None:
+                return None
+            return {
+                'career_name': obj.top_career_name,
+                'match_score': float(obj.top_match_score)
+            }
+        top_rec = obj.ranking.filter(rank=1).first()
         if top_rec:
             return {
                 'career_name': top_rec.career_name,
@@ -111,7 +121,9 @@ class AssessmentListSerializer(serializers.ModelSerializer):
         return None
     
     def get_recommendations_count(self, obj):
-        return obj.recommendations.count()
+        if hasattr(obj, 'recommendations_count'):
+            return obj.recommendations_count
+        return obj.ranking.count()
 
 
 class CareerDetailSerializer(serializers.ModelSerializer):
@@ -1,89 +1,169 @@
 
-import sys
-import os
-from django.conf import settings
-
-# Add ml_model to Python path
-ml_model_path = os.path.join(settings.BASE_DIR, 'ml_model')
-if ml_model_path not in sys.path:
-    sys.path.insert(0, ml_model_path)
-
-# Try importing ML prediction function
-ML_MODEL_AVAILABLE = False
-predict_careers = None
-
-try:
-    # Try importing from ml_model package
-    from ml_model.predict import predict_careers
-    ML_MODEL_AVAILABLE = True
-    print("✓ ML model loaded successfully")
-except ImportError as e:
-    print(f"⚠️  ML model not available: {e}")
-    print("   Using mock recommendations instead")
-    ML_MODEL_AVAILABLE = False
-
-from .models import Assessment, Recommendation
+import hashlib
+import json
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Func, OuterRef, Subquery, When
+
+from ml_model import engine
+from .models import Assessment, PredictionResult, Recommendation, Vocabulary
+from .vocabulary import encode_codes, encode_masks
+
+logger = logging.getLogger(__name__)
+
+# Marks rankings made up while no model was loaded; nothing should learn from them
+MOCK_RATIONALE_NOTE = 'Mock data - ML model not available'
+
+
+def run_prediction(assessment_data):
+    """Score one assessment; the ML stack is imported on first use."""
+    return engine.run_prediction(assessment_data)
+
+
+def inference_stats():
+    """Throughput/latency counters of the micro-batcher, if it has been used."""
+    return engine.inference_stats()
+
+
+def input_hash(assessment_data):
+    """sha256 of the inputs a stored ranking depends on.
+
+    Skills are a set to the model and the skill-gap analysis, so they are
+    sorted and de-duplicated. Interests keep their order: the first is a
+    model feature and the list is copied into every rationale.
+    """
+    payload = {
+        'skills': sorted(set(assessment_data['skills'])),
+        'interests': list(assessment_data['interests']),
+        'education': assessment_data['education'].strip(),
+        'work_style': assessment_data['work_style'].strip(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
 
 def create_assessment_with_recommendations(user, assessment_data):
     
-    # Step 1: Create and save assessment
-    assessment = Assessment.objects.create(
-        user=user,
-        skills=assessment_data['skills'],
-        interests=assessment_data['interests'],
-        education_level=assessment_data['education'],
-        work_style=assessment_data['work_style']
-    )
-    
-    # Step 2: Get ML predictions
-    if ML_MODEL_AVAILABLE:
+    # Step 1: Reuse the ranking stored for identical inputs and the same
+    # model, or get ML predictions. Inference never runs inside the write
+    # transaction below
+    digest = input_hash(assessment_data)
+    model_version = None
+    shared_result = None
+    ml_predictions = None
+    error = None
+    if engine.is_available():
         try:
-            # Call ML model
-            ml_predictions = predict_careers(assessment_data)
-            
-            # Step 3: Save each recommendation
-            recommendations = []
-            for pred in ml_predictions:
-                recommendation = Recommendation.objects.create(
-                    assessment=assessment,
-                    career_name=pred['career_name'],
-                    match_score=pred['match_score'],
-                    confidence_level=pred['confidence_level'],
-                    rank=pred['rank'],
-                    matching_skills=pred['matching_skills'],
-                    missing_skills=pred['missing_skills'],
-                    completeness_percent=pred['completeness_percent'],
-                    rationale={
-                        'interests_alignment': assessment_data['interests'],
-                        'education_match': True,  # Can add logic here
-                        'work_style_match': True
-                    }
-                )
-                recommendations.append(recommendation)
-            
-            return {
-                'assessment': assessment,
-                'recommendations': recommendations
-            }
-        
+            model_version = engine.model_version()
+            shared_result = PredictionResult.objects.filter(
+                input_hash=digest,
+                model_version=model_version
+            ).first()
+            if shared_result is None:
+                ml_predictions = run_prediction(assessment_data)
+                if engine.model_version() != model_version:
+                    # Hot reload during inference: either model may have
+                    # scored it, so this ranking is not shared
+                    model_version = None
         except Exception as e:
             # ML model failed - log error but don't crash
-            print(f"❌ ML prediction error: {e}")
-            # Return assessment with empty recommendations
-            return {
-                'assessment': assessment,
-                'recommendations': [],
-                'error': str(e)
-            }
-    
+            logger.exception("ML prediction failed for user %s", user.pk)
+            error = str(e)
     else:
         # ML model not available - return mock data for testing
-        print("⚠️  Using mock recommendations (ML model not available)")
-        recommendations = create_mock_recommendations(assessment, assessment_data)
-        return {
-            'assessment': assessment,
-            'recommendations': recommendations
-        }
+        logger.warning("Using mock recommendations (ML model not available)")
+
+    # Encode skills/interests as vocabulary codes before the transaction too;
+    # the first call per process reads the Vocabulary table
+    masks = {
+        **encode_masks(Vocabulary.SKILL, assessment_data['skills']),
+        **encode_masks(Vocabulary.INTEREST, assessment_data['interests']),
+    }
+    skill_codes = [
+        (encode_codes(Vocabulary.SKILL, pred['matching_skills']),
+         encode_codes(Vocabulary.SKILL, pred['missing_skills']))
+        for pred in ml_predictions or []
+    ]
+    rationale = {
+        'interests_alignment': assessment_data['interests'],
+        'education_match': True,  # Can add logic here
+        'work_style_match': True
+    }
+
+    def build_recommendations(**owner):
+        return [
+            Recommendation(
+                career_name=pred['career_name'],
+                match_score=pred['match_score'],
+                confidence_level=pred['confidence_level'],
+                rank=pred['rank'],
+                matching_skills=pred['matching_skills'],
+                missing_skills=pred['missing_skills'],
+                matching_skill_codes=matching_codes,
+                missing_skill_codes=missing_codes,
+                completeness_percent=pred['completeness_percent'],
+                rationale=rationale,
+                **owner
+            )
+            for pred, (matching_codes, missing_codes) in zip(ml_predictions, skill_codes)
+        ]
+
+    # Step 2: Save the assessment and its recommendations as one unit. A new
+    # shareable ranking is one INSERT for the PredictionResult and one bulk
+    # INSERT of its recommendations; a reused one adds only the assessment
+    recommendations = None
+    with transaction.atomic():
+        if ml_predictions is not None and model_version is not None:
+            # Not found in step 1, so INSERT straight away; the savepoint
+            # covers an identical submission that stored it since
+            try:
+                with transaction.atomic():
+                    shared_result = PredictionResult.objects.create(
+                        input_hash=digest,
+                        model_version=model_version
+                    )
+            except IntegrityError:
+                shared_result = PredictionResult.objects.get(
+                    input_hash=digest,
+                    model_version=model_version
+                )
+            else:
+                recommendations = Recommendation.objects.bulk_create(
+                    build_recommendations(result=shared_result)
+                )
+
+        assessment = Assessment.objects.create(
+            user=user,
+            skills=assessment_data['skills'],
+            interests=assessment_data['interests'],
+            **masks,
+            input_hash=digest,
+            prediction_result=shared_result,
+            education_level=assessment_data['education'],
+            work_style=assessment_data['work_style']
+        )
+
+        if shared_result is None:
+            if ml_predictions is not None:
+                recommendations = Recommendation.objects.bulk_create(
+                    build_recommendations(assessment=assessment)
+                )
+            elif error is None:
+                recommendations = create_mock_recommendations(assessment, assessment_data)
+            else:
+                # Keep the assessment with empty recommendations
+                recommendations = []
+
+    if recommendations is None:
+        recommendations = list(assessment.ranking)
+
+    result = {
+        'assessment': assessment,
+        'recommendations': recommendations
+    }
+    if error is not None:
+        result['error'] = error
+    return result
 
 
 def create_mock_recommendations(assessment, assessment_data):
@@ -135,27 +215,60 @@ def create_mock_recommendations(assessment, assessment_data):
         }
     ]
     
-    # Create recommendation objects
-    recommendations = []
-    for career_data in mock_careers:
-        recommendation = Recommendation.objects.create(
+    # Create recommendation objects in one INSERT
+    rationale = {
+        'interests_alignment': assessment_data['interests'],
+        'education_match': True,
+        'work_style_match': True,
+        'note': MOCK_RATIONALE_NOTE
+    }
+    return Recommendation.objects.bulk_create([
+        Recommendation(
             assessment=assessment,
-            **career_data,
-            rationale={
-                'interests_alignment': assessment_data['interests'],
-                'education_match': True,
-                'work_style_match': True,
-                'note': 'Mock data - ML model not available'
-            }
+            rationale=rationale,
+            matching_skill_codes=encode_codes(Vocabulary.SKILL, career_data['matching_skills']),
+            missing_skill_codes=encode_codes(Vocabulary.SKILL, career_data['missing_skills']),
+            **career_data
         )
-        recommendations.append(recommendation)
-    
-    return recommendations
+        for career_data in mock_careers
+    ])
 
 
 def get_user_assessment_history(user):
+    """User's assessments, newest first, with the history summary computed in SQL.
+
+    recommendations_count, top_career_name and top_match_score are
+    correlated subqueries rather than a JOIN + GROUP BY, so the whole page
+    is one query however long the history, and the database can walk the
+    (user, -created_at, -id) index and stop after one page instead of
+    aggregating and sorting every assessment of the user first.
+    The subqueries read the assessment's own recommendations, or those of
+    its shared PredictionResult; CASE picks one per row, so each side is an
+    index lookup (an OR of both owners would scan the table).
+    """
+    def per_owner(build):
+        own = Recommendation.objects.filter(assessment=OuterRef('pk')).order_by()
+        shared = Recommendation.objects.filter(result=OuterRef('prediction_result')).order_by()
+        return Case(
+            When(prediction_result__isnull=True, then=build(own)),
+            default=build(shared)
+        )
+
     assessments = Assessment.objects.filter(
         user=user
-    ).prefetch_related('recommendations').order_by('-created_at')
+    ).annotate(
+        # COUNT as a plain function: no GROUP BY, always exactly one row
+        recommendations_count=per_owner(
+            lambda recommendations: Subquery(
+                recommendations.annotate(total=Func('id', function='COUNT')).values('total')
+            )
+        ),
+        top_career_name=per_owner(
+            lambda recommendations: Subquery(recommendations.filter(rank=1).order_by('id').values('career_name')[:1])
+        ),
+        top_match_score=per_owner(
+            lambda recommendations: Subquery(recommendations.filter(rank=1).order_by('id').values('match_score')[:1])
+        ),
+    ).order_by('-created_at', '-id')
     
     return assessments
@@ -1,3 +1,488 @@
-from django.test import TestCase
+import importlib
+import threading
+from contextlib import contextmanager
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.apps import apps
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import OperationalError, connection, transaction
+
+from career_api.db_backends.sqlite3.base import write_lock
+from career_api.db_routing import PIN_COOKIE, PrimaryReplicaRouter, ReplicaStickinessMiddleware, is_pinned, pin_to_primary
+
+from . import vocabulary
+from .models import Assessment, CareerDetail, PredictionResult, Recommendation, Vocabulary
+from .serializers import AssessmentListSerializer
+from .services import create_assessment_with_recommendations, get_user_assessment_history
+
+ASSESSMENT = {
+    'skills': ['Programming', 'Data Analysis', 'Communication'],
+    'interests': ['Technology & Innovation', 'Problem Solving'],
+    'education': "Bachelor's Degree",
+    'work_style': 'Remote',
+}
+
+
+def fake_predictions(assessment_data, top_k=5):
+    return [
+        {
+            'career_name': f'Career {rank}',
+            'match_score': 90.0 - rank,
+            'confidence_level': 'High',
+            'rank': rank,
+            'matching_skills': assessment_data['skills'][:1],
+            'missing_skills': ['Git'],
+            'completeness_percent': 50.0,
+        }
+        for rank in range(1, top_k + 1)
+    ]
+
+
+@contextmanager
+def serving(model_version='model-1', **run_prediction):
+    """Patch the engine as if a model with ``model_version`` were loaded; yields the mocks."""
+    mocks = {
+        'is_available': mock.Mock(return_value=True),
+        'model_version': mock.Mock(return_value=model_version),
+        'run_prediction': mock.Mock(**run_prediction),
+    }
+    with mock.patch.multiple('recommendations.services.engine', **mocks):
+        yield mocks
+
+
+def create_user(name='student'):
+    return get_user_model().objects.create_user(f'{name}@example.com', name, 'password')
+
+
+class SubmitAssessmentQueryTests(TransactionTestCase):
+    """The submit path writes with a fixed number of queries, in one transaction."""
+
+    # Reads outside atomic() go to the replica alias when DATABASE_REPLICA is set;
+    # the counts pin to the primary, as the middleware does for a POST
+    databases = '__all__'
+
+    def setUp(self):
+        self.user = create_user()
+        # Warm the vocabulary cache so the counts do not depend on test order;
+        # codes cached by an earlier test may not exist in this flushed database
+        vocabulary.clear_cache()
+        vocabulary.vocabulary_codes(Vocabulary.SKILL)
+        vocabulary.vocabulary_codes(Vocabulary.INTEREST)
+
+    def test_ml_path_is_one_transaction_with_bulk_insert(self):
+        with serving(side_effect=fake_predictions):
+            # SELECT shared result; BEGIN, SAVEPOINT, INSERT result, RELEASE,
+            # one bulk INSERT of recommendations, INSERT assessment, COMMIT
+            with pin_to_primary(), self.assertNumQueries(8):
+                result = create_assessment_with_recommendations(self.user, ASSESSMENT)
+
+        self.assertEqual(len(result['recommendations']), 5)
+        self.assertTrue(all(r.pk for r in result['recommendations']))
+        self.assertEqual(result['assessment'].ranking.count(), 5)
+
+    def test_identical_inputs_reuse_the_stored_ranking(self):
+        other = create_user('other')
+        with serving(side_effect=fake_predictions) as engine:
+            first = create_assessment_with_recommendations(self.user, ASSESSMENT)
+            # Skill order and surrounding whitespace do not change the ranking
+            same = dict(ASSESSMENT, skills=ASSESSMENT['skills'][::-1], education=f" {ASSESSMENT['education']} ")
+            # SELECT shared result; BEGIN, INSERT assessment, COMMIT; SELECT its recommendations
+            with pin_to_primary(), self.assertNumQueries(5):
+                second = create_assessment_with_recommendations(other, same)
+
+        self.assertEqual(engine['run_prediction'].call_count, 1)
+        self.assertEqual(second['assessment'].input_hash, first['assessment'].input_hash)
+        self.assertEqual(second['assessment'].prediction_result_id, first['assessment'].prediction_result_id)
+        self.assertEqual([r.pk for r in second['recommendations']], [r.pk for r in first['recommendations']])
+        self.assertEqual((Assessment.objects.count(), Recommendation.objects.count()), (2, 5))
+
+    def test_new_model_version_or_inputs_get_a_new_ranking(self):
+        with serving(side_effect=fake_predictions):
+            create_assessment_with_recommendations(self.user, ASSESSMENT)
+            create_assessment_with_recommendations(self.user, dict(ASSESSMENT, interests=['Analytics']))
+        with serving('model-2', side_effect=fake_predictions):
+            create_assessment_with_recommendations(self.user, ASSESSMENT)
+
+        self.assertEqual(PredictionResult.objects.count(), 3)
+        self.assertEqual(Recommendation.objects.count(), 15)
+
+    def test_hot_reload_during_inference_keeps_the_ranking_private(self):
+        with serving(side_effect=fake_predictions) as engine:
+            engine['model_version'].side_effect = ['model-1', 'model-2']
+            result = create_assessment_with_recommendations(self.user, ASSESSMENT)
+
+        self.assertIsNone(result['assessment'].prediction_result)
+        self.assertFalse(PredictionResult.objects.exists())
+        self.assertEqual(result['assessment'].recommendations.count(), 5)
+
+    def test_mock_path_uses_bulk_insert(self):
+        with mock.patch('recommendations.services.engine.is_available', return_value=False), \
+                self.assertLogs('recommendations.services', 'WARNING'):
+            with self.assertNumQueries(4):
+                result = create_assessment_with_recommendations(self.user, ASSESSMENT)
+
+        self.assertEqual([r.rank for r in result['recommendations']], [1, 2, 3, 4, 5])
+
+    def test_failed_insert_rolls_back_the_assessment(self):
+        broken = fake_predictions(ASSESSMENT)
+        broken[-1]['confidence_level'] = None  # NOT NULL violation on the bulk INSERT
+        with serving(return_value=broken):
+            with self.assertRaises(Exception):
+                create_assessment_with_recommendations(self.user, ASSESSMENT)
+
+        self.assertFalse(Assessment.objects.exists())
+
+
+def add_assessments(user, count, recommendations=5):
+    """Bulk-insert ``count`` assessments with ranked recommendations for ``user``."""
+    assessments = Assessment.objects.bulk_create([
+        Assessment(user=user, skills=ASSESSMENT['skills'], interests=ASSESSMENT['interests'],
+                   education_level=ASSESSMENT['education'], work_style=ASSESSMENT['work_style'])
+        for _ in range(count)
+    ])
+    Recommendation.objects.bulk_create([
+        Recommendation(assessment=assessment, rationale={}, **pred)
+        for assessment in assessments
+        for pred in fake_predictions(ASSESSMENT, top_k=recommendations)
+    ])
+    return assessments
+
+
+class AssessmentHistoryTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_login(self.user)
+
+    def _history_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/assessment/history/', {'page_size': 100})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'], len(queries)
+
+    def test_query_count_does_not_grow_with_history(self):
+        add_assessments(self.user, 3)
+        small, small_queries = self._history_queries()
+        add_assessments(self.user, 40)
+        large, large_queries = self._history_queries()
+
+        self.assertEqual((len(small), len(large)), (3, 43))
+        self.assertEqual(large_queries, small_queries)
+
+    def test_annotations_match_per_row_lookups(self):
+        add_assessments(self.user, 2)
+        add_assessments(self.user, 1, recommendations=0)
+        add_assessments(create_user('other'), 2)
+
+        annotated = AssessmentListSerializer(get_user_assessment_history(self.user).order_by('id'), many=True).data
+        plain = AssessmentListSerializer(Assessment.objects.filter(user=self.user).order_by('id'), many=True).data
+
+        self.assertEqual(annotated, plain)
+        self.assertEqual(sorted(row['recommendations_count'] for row in annotated), [0, 5, 5])
+        self.assertIn({'career_name': 'Career 1', 'match_score': 89.0},
+                      [row['top_recommendation'] for row in annotated])
+
+    def test_shared_rankings_show_in_history_and_detail(self):
+        add_assessments(self.user, 1)
+        with serving(side_effect=fake_predictions):
+            shared = [create_assessment_with_recommendations(self.user, ASSESSMENT)['assessment']
+                      for _ in range(2)]
+
+        annotated = AssessmentListSerializer(get_user_assessment_history(self.user).order_by('id'), many=True).data
+        plain = AssessmentListSerializer(Assessment.objects.filter(user=self.user).order_by('id'), many=True).data
+        detail = self.client.get(f'/api/assessment/{shared[1].id}/').json()
+
+        self.assertEqual(annotated, plain)
+        self.assertEqual([row['recommendations_count'] for row in annotated], [5, 5, 5])
+        self.assertEqual([r['rank'] for r in detail['recommendations']], [1, 2, 3, 4, 5])
+
+    def test_admin_shows_shared_rankings(self):
+        with serving(side_effect=fake_predictions):
+            shared = create_assessment_with_recommendations(self.user, ASSESSMENT)['assessment']
+        self.client.force_login(get_user_model().objects.create_superuser('admin@example.com', 'admin', 'pw'))
+
+        assessment_page = self.client.get(f'/admin/recommendations/assessment/{shared.id}/change/')
+        result_page = self.client.get(f'/admin/recommendations/predictionresult/{shared.prediction_result_id}/change/')
+
+        self.assertContains(assessment_page, '#1 Career 1 (89.00%)')
+        self.assertContains(result_page, 'Career 5')
+        self.assertEqual([r.rank for r in Recommendation.objects.filter(result=shared.prediction_result)],
+                         [1, 2, 3, 4, 5])
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_login(self.user)
+
+    def _walk(self, url, **params):
+        ids, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            payload = response.json()
+            ids.extend(row['id'] for row in payload['results'])
+            pages += 1
+            if payload['next'] is None:
+                return ids, pages
+            response = self.client.get(payload['next'])
+
+    def test_history_pages_cover_every_assessment_once_newest_first(self):
+        assessments = add_assessments(self.user, 25)
+        add_assessments(create_user('other'), 5)
+
+        ids, pages = self._walk('/api/assessment/history/', page_size=10)
+
+        self.assertEqual(pages, 3)
+        # Same created_at down to the microsecond is possible; id breaks the tie
+        expected = Assessment.objects.filter(user=self.user).order_by('-created_at', '-id')
+        self.assertEqual(ids, [a.id for a in expected])
+        self.assertEqual(set(ids), {a.id for a in assessments})
+
+    def test_inserts_while_paging_do_not_shift_later_pages(self):
+        add_assessments(self.user, 6)
+        first = self.client.get('/api/assessment/history/', {'page_size': 3}).json()
+        add_assessments(self.user, 4)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(first['next']).json()
+
+        seen = [row['id'] for row in first['results'] + second['results']]
+        self.assertEqual(len(set(seen)), 6)
+        self.assertFalse(any('OFFSET' in q['sql'].upper() for q in queries))
+
+    def test_career_list_is_paginated_by_name(self):
+        CareerDetail.objects.bulk_create([
+            CareerDetail(career_name=name, description='', requirements={}, salary_info={},
+                         job_growth='', work_environment='', learning_resources=[], related_careers=[])
+            for name in ['Teacher', 'Accountant', 'Nurse', 'Data Analyst', 'Engineer']
+        ])
+        response = self.client.get('/api/careers/', {'page_size': 2})
+        names = [row['career_name'] for row in response.json()['results']]
+        ids, pages = self._walk('/api/careers/', page_size=2)
+
+        self.assertEqual(names, ['Accountant', 'Data Analyst'])
+        self.assertEqual((len(ids), pages), (5, 3))
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get('/api/assessment/history/', {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_detail_urls_reach_their_views(self):
+        assessment = add_assessments(self.user, 1)[0]
+        CareerDetail.objects.create(career_name='Nurse', description='', requirements={}, salary_info={},
+                                    job_growth='', work_environment='')
+
+        detail = self.client.get(f'/api/assessment/{assessment.id}/')
+        career = self.client.get('/api/careers/Nurse/')
+
+        self.assertEqual((detail.status_code, detail.json()['id']), (200, assessment.id))
+        self.assertEqual((career.status_code, career.json()['career_name']), (200, 'Nurse'))
+
+
+@skipUnless(connection.settings_dict['ENGINE'] == 'career_api.db_backends.sqlite3', 'tuned SQLite backend only')
+class SQLiteBackendTests(TransactionTestCase):
+    """PRAGMAs on connect; write transactions hold the process-wide write lock."""
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_applied_to_new_connections(self):
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('cache_size'), -64 * 1024)
+
+    def test_atomic_holds_the_write_lock_until_commit_or_rollback(self):
+        lock = write_lock(connection.settings_dict['NAME'])
+        with transaction.atomic():
+            self.assertTrue(connection.holds_write_lock)
+            self.assertFalse(lock.acquire(blocking=False))
+        self.assertFalse(connection.holds_write_lock)
+
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                create_user()
+                raise ValueError
+        self.assertFalse(connection.holds_write_lock)
+        self.assertTrue(lock.acquire(blocking=False))
+        lock.release()
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_writer_times_out_instead_of_waiting_forever(self):
+        lock = write_lock(connection.settings_dict['NAME'])
+        # Another writer of this process holds the lock for the whole test
+        holder = threading.Thread(target=lock.acquire)
+        holder.start()
+        holder.join()
+        try:
+            with mock.patch.dict(connection.settings_dict['OPTIONS'], {'pragmas': {'busy_timeout': 10}}):
+                with self.assertRaisesMessage(OperationalError, 'database is locked'):
+                    with transaction.atomic():
+                        pass
+            self.assertFalse(connection.holds_write_lock)
+        finally:
+            lock.release()
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica', REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Catalog and history reads go to the replica unless the client just wrote."""
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def test_reads_of_replica_apps_go_to_the_replica(self):
+        self.assertEqual(self.router.db_for_read(Assessment), 'replica')
+        self.assertEqual(self.router.db_for_read(CareerDetail), 'replica')
+        # Sessions and users stay consistent with the login that just happened
+        self.assertEqual(self.router.db_for_read(get_user_model()), 'default')
+        self.assertEqual(self.router.db_for_write(Assessment), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'recommendations'))
+
+    def test_pinned_or_transactional_reads_use_the_primary(self):
+        with pin_to_primary():
+            self.assertEqual(self.router.db_for_read(Assessment), 'default')
+        with mock.patch.object(connection, 'in_atomic_block', True):
+            self.assertEqual(self.router.db_for_read(Assessment), 'default')
+
+    @override_settings(DATABASE_REPLICA_ALIAS=None)
+    def test_without_a_replica_everything_uses_default(self):
+        self.assertEqual(self.router.db_for_read(Assessment), 'default')
+
+    def _pinned_during(self, request, status=200):
+        seen = {}
+
+        def view(request):
+            seen['pinned'] = is_pinned()
+            return HttpResponse(status=status)
+
+        response = ReplicaStickinessMiddleware(view)(request)
+        return seen['pinned'], response
+
+    def test_reads_after_a_write_stick_to_the_primary(self):
+        pinned, response = self._pinned_during(self.factory.get('/api/assessment/history/'))
+        self.assertFalse(pinned)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        pinned, response = self._pinned_during(self.factory.post('/api/assessment/'), status=201)
+        self.assertTrue(pinned)
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], 5)
+
+        follow_up = self.factory.get('/api/assessment/history/')
+        follow_up.COOKIES[PIN_COOKIE] = cookie.value
+        self.assertTrue(self._pinned_during(follow_up)[0])
+        self.assertFalse(is_pinned())
+
+    def test_failed_writes_and_expired_cookies_do_not_pin(self):
+        _, response = self._pinned_during(self.factory.post('/api/assessment/'), status=400)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        expired = self.factory.get('/api/assessment/history/')
+        expired.COOKIES[PIN_COOKIE] = '1.0'
+        self.assertFalse(self._pinned_during(expired)[0])
+
+
+class VocabularyTests(TestCase):
+    """Skills/interests as stable codes: masks on Assessment, code arrays on Recommendation."""
+
+    def setUp(self):
+        vocabulary.clear_cache()
+        self.addCleanup(vocabulary.clear_cache)
+        self.user = create_user()
+
+    def submit(self, skills, interests=('Analytics', 'Problem Solving')):
+        data = dict(ASSESSMENT, skills=list(skills), interests=list(interests))
+        with serving(side_effect=fake_predictions):
+            return create_assessment_with_recommendations(self.user, data)['assessment']
+
+    def test_codes_are_stable_when_the_catalog_grows(self):
+        before = dict(vocabulary.vocabulary_codes(Vocabulary.SKILL))
+        self.assertEqual(before['Programming'], 0)
+
+        grown = vocabulary.catalog_terms(Vocabulary.SKILL) + ['Rust']
+        with mock.patch('recommendations.vocabulary.catalog_terms', return_value=grown):
+            vocabulary.clear_cache()
+            after = vocabulary.vocabulary_codes(Vocabulary.SKILL)
+
+        self.assertEqual(after['Rust'], max(before.values()) + 1)
+        self.assertEqual({term: after[term] for term in before}, before)
+
+    def test_submission_stores_masks_and_code_arrays(self):
+        assessment = self.submit(['Programming', 'Marketing', 'Juggling'])
+        recommendation = assessment.ranking.get(rank=1)
+
+        # Free-text terms outside the catalog stay in the JSON only
+        self.assertEqual(vocabulary.decode_mask(Vocabulary.SKILL, assessment.skill_mask),
+                         ['Programming', 'Marketing'])
+        self.assertEqual(vocabulary.decode_mask(Vocabulary.INTEREST, assessment.interest_mask),
+                         ['Analytics', 'Problem Solving'])
+        self.assertEqual(vocabulary.decode_codes(Vocabulary.SKILL, recommendation.missing_skill_codes), ['Git'])
+        self.assertEqual(vocabulary.decode_codes(Vocabulary.SKILL, recommendation.matching_skill_codes),
+                         ['Programming'])
+
+    def test_skill_filters_are_bitwise_sql(self):
+        coder = self.submit(['Programming', 'Data Analysis', 'DevOps'])
+        marketer = self.submit(['Marketing', 'Sales', 'Programming'])
+        self.submit(['Patient Care', 'Clinical Skills', 'Medical Research'])
+        assessments = Assessment.objects.order_by('id')
+
+        both = vocabulary.assessments_with_skills(assessments, ['Programming', 'Marketing'])
+        either = vocabulary.assessments_with_skills(assessments, ['DevOps', 'Sales'], match='any')
+
+        self.assertIn('&', str(both.query))
+        self.assertEqual(list(both), [marketer])
+        self.assertEqual(list(either), [coder, marketer])
+        self.assertEqual(vocabulary.assessments_with_interests(assessments, ['Analytics']).count(), 3)
+        with self.assertRaises(ValueError):
+            vocabulary.assessments_with_skills(assessments, ['Juggling'])
+
+    def test_skills_past_the_first_mask_column_are_filterable(self):
+        codes = vocabulary.vocabulary_codes(Vocabulary.SKILL)
+        self.assertGreaterEqual(codes['Typography'], vocabulary.MASK_BITS)
+        analyst = self.submit(['Programming', 'SQL', 'Statistics'])
+        designer = self.submit(['Graphic Design', 'Typography'])
+        self.submit(['Programming', 'Marketing'])
+        assessments = Assessment.objects.order_by('id')
+
+        sql = vocabulary.assessments_with_skills(assessments, ['Programming', 'SQL'])
+        either = vocabulary.assessments_with_skills(assessments, ['Statistics', 'Typography'], match='any')
+
+        self.assertIn('skill_mask_high', str(sql.query))
+        self.assertEqual(list(sql), [analyst])
+        self.assertEqual(list(either), [analyst, designer])
+        self.assertEqual(vocabulary.decode_mask(Vocabulary.SKILL, designer.skill_mask, designer.skill_mask_high),
+                         ['Graphic Design', 'Typography'])
+
+    def test_backfill_migration_encodes_existing_rows(self):
+        assessment = add_assessments(self.user, 3)[0]
+        self.assertEqual(Assessment.objects.filter(skill_mask=0).count(), 3)
+        migration = importlib.import_module('recommendations.migrations.0004_backfill_vocabulary_masks')
+
+        with mock.patch.object(migration, 'BATCH_SIZE', 2):
+            migration.backfill(apps, mock.Mock(connection=connection))
+
+        assessment.refresh_from_db()
+        self.assertFalse(Assessment.objects.filter(skill_mask=0).exists())
+        self.assertEqual(vocabulary.decode_mask(Vocabulary.SKILL, assessment.skill_mask),
+                         [s for s in ASSESSMENT['skills'] if s in vocabulary.vocabulary_codes(Vocabulary.SKILL)])
+        self.assertFalse(Recommendation.objects.filter(missing_skill_codes=[]).exists())
+
+    def test_backfill_migration_sets_the_high_skill_mask(self):
+        vocabulary.vocabulary_codes(Vocabulary.SKILL)
+        assessment = Assessment.objects.create(user=self.user, skills=['Programming', 'SQL', 'Typography'],
+                                               interests=[], education_level='', work_style='')
+        migration = importlib.import_module('recommendations.migrations.0008_backfill_skill_mask_high')
+
+        migration.backfill(apps, mock.Mock(connection=connection))
+
+        assessment.refresh_from_db()
+        self.assertEqual(vocabulary.decode_mask(Vocabulary.SKILL, 0, assessment.skill_mask_high), ['SQL', 'Typography'])
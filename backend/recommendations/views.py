@@ -22,6 +22,7 @@ from .serializers import (
     RecommendationSerializer,
     CareerDetailSerializer
 )
+from .pagination import AssessmentHistoryPagination, CareerPagination
 from .services import create_assessment_with_recommendations, get_user_assessment_history
 
 
@@ -127,37 +128,42 @@ def assessment_history(request):
     Get User's Assessment History
     
     Method: GET
-    URL: /api/assessment/history/
+    URL: /api/assessment/history/?cursor=<next cursor>&page_size=20
+    
+    Newest first, paginated by cursor (see pagination.py). Follow "next"
+    until it is null.
     
     Response (200):
-    [
-        {
-            "id": 3,
-            "skills": [...],
-            "interests": [...],
-            "education_level": "Bachelor's Degree",
-            "work_style": "Remote",
-            "created_at": "2025-03-20T10:30:00Z",
-            "top_recommendation": {
-                "career_name": "Software Developer",
-                "match_score": 98.0
+    {
+        "next": "http://.../api/assessment/history/?cursor=WyIyMDI1...",
+        "results": [
+            {
+                "id": 3,
+                "skills": [...],
+                "interests": [...],
+                "education_level": "Bachelor's Degree",
+                "work_style": "Remote",
+                "created_at": "2025-03-20T10:30:00Z",
+                "top_recommendation": {
+                    "career_name": "Software Developer",
+                    "match_score": 98.0
+                },
+                "recommendations_count": 5
             },
-            "recommendations_count": 5
-        },
-        {
-            "id": 2,
             ...
-        }
-    ]
+        ]
+    }
     """
     
-    # Get all assessments for current user
+    # Get one page of the current user's assessments
     assessments = get_user_assessment_history(request.user)
+    paginator = AssessmentHistoryPagination()
+    page = paginator.paginate_queryset(assessments, request)
     
     # Serialize with lightweight serializer
-    serializer = AssessmentListSerializer(assessments, many=True)
+    serializer = AssessmentListSerializer(page, many=True)
     
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(['GET'])
@@ -226,25 +232,31 @@ def career_list(request):
     Get List of All Careers
     
     Method: GET
-    URL: /api/careers/
+    URL: /api/careers/?cursor=<next cursor>&page_size=50
+    
+    Alphabetical by career_name, paginated by cursor (see pagination.py).
     
     Response (200):
-    [
-        {
-            "id": 1,
-            "career_name": "Software Developer",
-            "description": "...",
-            "job_growth": "+22%",
+    {
+        "next": "http://.../api/careers/?cursor=WyJEYXRh...",
+        "results": [
+            {
+                "id": 1,
+                "career_name": "Software Developer",
+                "description": "...",
+                "job_growth": "+22%",
+                ...
+            },
             ...
-        },
-        ...
-    ]
+        ]
+    }
     """
     
-    careers = CareerDetail.objects.all()
+    paginator = CareerPagination()
+    careers = paginator.paginate_queryset(CareerDetail.objects.all(), request)
     serializer = CareerDetailSerializer(careers, many=True)
     
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(['GET'])
@@ -0,0 +1,189 @@
+"""
+Integer codes for skills and interests
+
+Every catalog skill and interest (ml_model.career_data) has a stable code
+in the Vocabulary table. Assessments store their skills and interests as
+bitmasks (bit i = term with code i). Recommendations store their
+matching and missing skills as lists of codes. The JSON string columns
+stay the source of truth for the API: they also hold free-text terms
+that are not in the catalog, and those terms are not encoded.
+
+A mask column is one signed 64-bit integer holding MASK_BITS codes, so a
+kind spreads its codes over the columns in MASK_FIELDS: column i holds
+codes i*MASK_BITS to (i+1)*MASK_BITS - 1. Skills the assessment form
+offers (SKILLS_LIST) and all interests get the lowest codes. Terms past
+the last column only appear in code arrays.
+
+Query helpers compile to bitwise SQL:
+    with_all_terms(Assessment.objects.all(), Vocabulary.SKILL, ['Programming', 'Marketing'])
+    -> WHERE ("skill_mask" & 1048577) = 1048577
+"""
+import threading
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from ml_model.career_data import CAREER_REQUIREMENTS, INTERESTS_LIST, SKILLS_LIST
+
+from .models import Vocabulary
+
+# Bit 63 is the sign bit; leaving it unused keeps masks non-negative
+MASK_BITS = 63
+
+# Assessment mask columns per kind, lowest codes first
+MASK_FIELDS = {
+    Vocabulary.SKILL: ('skill_mask', 'skill_mask_high'),
+    Vocabulary.INTEREST: ('interest_mask',),
+}
+
+_codes = {}
+_codes_lock = threading.Lock()
+
+
+def catalog_terms(kind):
+    """Catalog terms of ``kind`` in code order: form options first, then terms only careers use."""
+    if kind == Vocabulary.SKILL:
+        offered = [skill for skills in SKILLS_LIST.values() for skill in skills]
+        used = sorted({skill for career in CAREER_REQUIREMENTS.values() for skill in career['required_skills']})
+    elif kind == Vocabulary.INTEREST:
+        offered = list(INTERESTS_LIST)
+        used = sorted({interest for career in CAREER_REQUIREMENTS.values() for interest in career['interests']})
+    else:
+        raise ValueError(f"Unknown vocabulary kind {kind!r}")
+    return list(dict.fromkeys(offered + used))
+
+
+def sync_vocabulary(model=Vocabulary):
+    """Give every catalog term without a code the next free one; return {kind: {term: code}}.
+
+    ``model`` is the Vocabulary model, or its historical version in a migration.
+    """
+    codes = {}
+    for kind in (Vocabulary.SKILL, Vocabulary.INTEREST):
+        known = dict(model.objects.filter(kind=kind).values_list('term', 'code'))
+        next_code = max(known.values(), default=-1) + 1
+        new_terms = [term for term in catalog_terms(kind) if term not in known]
+        model.objects.bulk_create([
+            model(kind=kind, term=term, code=next_code + i) for i, term in enumerate(new_terms)
+        ])
+        known.update((term, next_code + i) for i, term in enumerate(new_terms))
+        codes[kind] = known
+    return codes
+
+
+def vocabulary_codes(kind):
+    """{term: code} for ``kind``, cached per process; codes never change once assigned.
+
+    Call it outside write transactions: codes assigned inside one that
+    later rolls back are returned but not cached.
+    """
+    if kind in _codes:
+        return _codes[kind]
+    with _codes_lock:
+        if kind in _codes:
+            return _codes[kind]
+        codes = dict(Vocabulary.objects.filter(kind=kind).values_list('term', 'code'))
+        if all(term in codes for term in catalog_terms(kind)):
+            _codes[kind] = codes
+            return codes
+
+        # Catalog grew since the last sync (or an empty table)
+        try:
+            with transaction.atomic():
+                codes = sync_vocabulary()[kind]
+        except IntegrityError:
+            # Another process assigned the codes first
+            codes = dict(Vocabulary.objects.filter(kind=kind).values_list('term', 'code'))
+        if not transaction.get_connection().in_atomic_block:
+            _codes[kind] = codes
+        return codes
+
+
+def clear_cache():
+    _codes.clear()
+
+
+def mask_from_codes(codes, terms, offset=0):
+    """Bitmask of the terms with codes ``offset`` to ``offset + MASK_BITS - 1``; others are skipped."""
+    mask = 0
+    for term in terms:
+        code = codes.get(term)
+        if code is not None and offset <= code < offset + MASK_BITS:
+            mask |= 1 << (code - offset)
+    return mask
+
+
+def codes_from_terms(codes, terms):
+    """Codes of the known terms, in input order."""
+    return [codes[term] for term in terms if term in codes]
+
+
+def encode_masks(kind, terms):
+    """{mask field: mask} for every MASK_FIELDS column of ``kind``."""
+    codes = vocabulary_codes(kind)
+    return {field: mask_from_codes(codes, terms, i * MASK_BITS) for i, field in enumerate(MASK_FIELDS[kind])}
+
+
+def encode_codes(kind, terms):
+    return codes_from_terms(vocabulary_codes(kind), terms)
+
+
+def decode_mask(kind, *masks):
+    """Terms whose bits are set in ``masks`` (MASK_FIELDS order), in code order."""
+    return [term for term, code in sorted(vocabulary_codes(kind).items(), key=lambda item: item[1])
+            if code // MASK_BITS < len(masks) and masks[code // MASK_BITS] >> code % MASK_BITS & 1]
+
+
+def decode_codes(kind, codes):
+    terms = {code: term for term, code in vocabulary_codes(kind).items()}
+    return [terms[code] for code in codes if code in terms]
+
+
+def query_masks(kind, terms):
+    """{mask field: mask} for a filter, without empty masks.
+
+    Unlike encode_masks, unknown terms or terms past the last column are an error.
+    """
+    codes = vocabulary_codes(kind)
+    fields = MASK_FIELDS[kind]
+    masks = {}
+    for term in terms:
+        if term not in codes:
+            raise ValueError(f"{term!r} is not a {kind} in the vocabulary")
+        column, bit = divmod(codes[term], MASK_BITS)
+        if column >= len(fields):
+            raise ValueError(f"{term!r} has code {codes[term]}, beyond the {kind} mask columns")
+        masks[fields[column]] = masks.get(fields[column], 0) | 1 << bit
+    return masks
+
+
+def _masked(queryset, masks):
+    """Alias ``field & mask`` per column; returns the queryset and {alias: mask}."""
+    aliases = {f'{field}_and_{mask}': (field, mask) for field, mask in masks.items()}
+    queryset = queryset.alias(**{alias: F(field).bitand(mask) for alias, (field, mask) in aliases.items()})
+    return queryset, {alias: mask for alias, (field, mask) in aliases.items()}
+
+
+def with_all_terms(queryset, kind, terms):
+    """Rows whose ``kind`` masks contain every term."""
+    queryset, masked = _masked(queryset, query_masks(kind, terms))
+    return queryset.filter(**masked)
+
+
+def with_any_term(queryset, kind, terms):
+    """Rows whose ``kind`` masks contain at least one of the terms."""
+    queryset, masked = _masked(queryset, query_masks(kind, terms))
+    condition = Q()
+    for alias in masked:
+        condition |= ~Q(**{alias: 0})
+    return queryset.filter(condition)
+
+
+def assessments_with_skills(queryset, skills, match='all'):
+    helper = with_all_terms if match == 'all' else with_any_term
+    return helper(queryset, Vocabulary.SKILL, skills)
+
+
+def assessments_with_interests(queryset, interests, match='all'):
+    helper = with_all_terms if match == 'all' else with_any_term
+    return helper(queryset, Vocabulary.INTEREST, interests)
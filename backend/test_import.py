@@ -11,11 +11,10 @@ sys.path.insert(0, os.path.dirname(__file__))
 print("Testing imports...")
 
 try:
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'ml_model'))
-    from predict import predict_careers
+    from ml_model.predict import predict_careers
     print("✓ predict_careers imported successfully")
     
-    from career_data import CAREER_LIST
+    from ml_model.career_data import CAREER_LIST
     print(f"✓ career_data imported successfully ({len(CAREER_LIST)} careers)")
     
     print("\n✓ All imports successful!")